@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Any, Dict, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -30,6 +31,49 @@ class Settings(BaseSettings):
     # CORS
     CORS_ORIGINS: list = ["*"]
 
+    # Gemini model routing
+    GEMINI_FAST_MODEL: str = "gemini-2.0-flash-lite"
+    GEMINI_STRONG_MODEL: str = "gemini-2.0-flash"
+    # Per-section overrides, e.g. {"skills": {"model": "...", "max_output_tokens": 256}}
+    SECTION_ROUTES: Dict[str, Dict[str, Any]] = {}
+    # USD per million tokens, used for per-route cost accounting
+    MODEL_PRICES: Dict[str, Dict[str, float]] = {
+        "gemini-2.0-flash": {"input": 0.10, "output": 0.40},
+        "gemini-2.0-flash-lite": {"input": 0.075, "output": 0.30},
+        "gemini-2.5-flash": {"input": 0.30, "output": 2.50},
+    }
+
+    # Application tracking spreadsheet (disabled when no id is set)
+    TRACKING_SPREADSHEET_ID: Optional[str] = None
+    # The tab must exist; the writer disables itself with an error otherwise
+    TRACKING_SHEET_RANGE: str = "Applications!A:K"
+    TRACKING_FLUSH_INTERVAL_SECONDS: float = 10.0
+    TRACKING_MAX_BATCH_ROWS: int = 50
+    TRACKING_MAX_RETRIES: int = 3
+
+    # Startup: preload discovery docs, open upstream connections, check templates
+    WARMUP_ON_STARTUP: bool = False
+    WARMUP_MODEL: str = "gemini-2.0-flash"
+
+    # Shared state (SQLite WAL file used by every worker process)
+    SHARED_STATE_PATH: str = "data/shared_state.db"
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    TEMPLATE_MANIFEST_TTL_SECONDS: int = 60 * 60
+
+    # Generation history (SQLite with FTS5), compacted to these bounds
+    HISTORY_DB_PATH: str = "data/history.db"
+    HISTORY_MAX_ENTRIES: int = 1000
+    HISTORY_MAX_AGE_DAYS: int = 180
+
+    # Upper bound for a generation request; remaining upstream work is skipped
+    REQUEST_DEADLINE_SECONDS: float = 300
+
+    # Idempotency-Key handling
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 60 * 60
+    # A run holding a key longer than this is treated as crashed
+    IDEMPOTENCY_IN_PROGRESS_TTL_SECONDS: int = 10 * 60
+    IDEMPOTENCY_WAIT_SECONDS: float = 5 * 60
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -39,6 +83,8 @@ class Settings(BaseSettings):
 class TemplateSettings(BaseSettings):
     TEMPLATE_ID: str
     KOREAN_TEMPLATE_ID: str
+    # Without a cover letter template a blank document is used
+    COVER_LETTER_TEMPLATE_ID: Optional[str] = None
 
     class Config:
         env_file = ".env"
@@ -8,7 +8,6 @@ from app.services.google_auth import (
 )
 
 router = APIRouter(prefix="/auth", tags=["auth"])
-settings = get_settings()
 
 
 @router.get("/google")
@@ -21,7 +20,7 @@ async def google_auth():
 async def google_auth_callback(code: str, state: str = None):
     """Handle Google OAuth callback."""
     try:
-        user_id = settings.TEST_USER_EMAIL
+        user_id = get_settings().TEST_USER_EMAIL
         credentials = get_credentials(code)
         save_credentials(credentials, user_id)
         return {"status": "success", "user_id": user_id}
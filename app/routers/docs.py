@@ -1,35 +1,61 @@
-from fastapi import APIRouter
+from typing import Optional
 
-from app.schemas.docs import DocumentRequest
+from fastapi import APIRouter, Header
+
+from app.schemas.docs import DocumentRequest, SheetRequest
 from app.services.google_auth import load_credentials
 from app.services.google_docs import (
     create_document,
     read_document,
     update_document,
 )
+from app.services.google_sheets import read_values
+from app.services.idempotency import run_idempotent
+from app.utils.responses import FastJSONResponse
 
 router = APIRouter(prefix="/docs", tags=["docs"])
 
 
-@router.post("/read")
-async def read_google_doc(request: DocumentRequest):
+@router.post("/read", response_class=FastJSONResponse)
+def read_google_doc(request: DocumentRequest):
     """Read content from a Google Doc."""
     credentials = load_credentials(request.user_id)
-    document = read_document(credentials, request.document_id)
+    document = read_document(
+        credentials,
+        request.document_id,
+        fields=request.fields,
+        plain_text=request.plain_text,
+    )
     return {"document": document}
 
 
 @router.post("/create")
-async def create_google_doc(title: str, user_id: str):
-    """Create a new Google Doc."""
-    credentials = load_credentials(user_id)
-    document = create_document(credentials, title)
-    return {"document": document}
+def create_google_doc(
+    title: str, user_id: str, idempotency_key: Optional[str] = Header(default=None)
+):
+    """Create a new Google Doc; a repeated Idempotency-Key returns the same one."""
+
+    def create() -> dict:
+        credentials = load_credentials(user_id)
+        document = create_document(credentials, title)
+        return {"document": document}
+
+    return run_idempotent(
+        "docs.create", idempotency_key, {"title": title, "user_id": user_id}, create
+    )
 
 
 @router.post("/update")
-async def update_google_doc(document_id: str, content: str, user_id: str):
+def update_google_doc(document_id: str, content: str, user_id: str):
     """Update content in a Google Doc."""
     credentials = load_credentials(user_id)
     update_document(credentials, document_id, content)
     return {"status": "success"}
+
+
+@router.post("/sheets/read")
+def read_google_sheet(request: SheetRequest):
+    """Read cell values from a Google Sheet, e.g. the application tracker."""
+    credentials = load_credentials(request.user_id)
+    values = read_values(credentials, request.spreadsheet_id, request.range_name)
+    return {"values": values}
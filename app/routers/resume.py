@@ -1,64 +1,426 @@
+import asyncio
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
 from google.oauth2.credentials import Credentials
+from starlette.concurrency import run_in_threadpool
 
-from app.config.settings import get_settings, get_template_settings
+from app.config.settings import get_settings
+from app.schemas.resume import CoverLetterRequest
+from app.services.cancellation import (
+    CancellationToken,
+    OperationCancelledError,
+    get_cancellation_stats,
+    record_avoided_work,
+    watch_disconnect,
+)
+from app.services.cover_letter import condense_job_description, generate_cover_letter
 from app.services.google_auth import get_google_credentials
-from app.services.google_docs import ResumeData, create_resume_document
-from app.services.resume_generator import generate_resume
+from app.services.google_docs import (
+    DocumentBackend,
+    ResumeData,
+    create_cover_letter_document,
+    create_resume_document,
+    discard_document,
+)
+from app.services.google_sheets import build_tracking_row, get_tracking_writer
+from app.services.history import get_generation_history
+from app.services.idempotency import run_idempotent
+from app.services.local_selector import SelectionMode
+from app.services.model_router import get_model_router
+from app.services.resume_generator import (
+    ResumeContent,
+    VariantStyle,
+    generate_resume_variants,
+    localize_resumes,
+)
 from app.services.toml_loader import load_resume_data
 from app.utils.language import Language, get_language_name
 
 router = APIRouter(prefix="/resume", tags=["resume"])
-settings = get_settings()
-template_settings = get_template_settings()
 
 # Path to the resume data TOML file
 RESUME_DATA_PATH = Path("app/config/resume_data.toml")
 
 
 @router.post("/generate-with-ai")
-def generate_resume_with_ai(
+async def generate_resume_with_ai(
+    request: Request,
     job_description: str,
-    language: Language = Query(default="en"),
+    language: List[Language] = Query(default=["en"]),
+    selection_mode: SelectionMode = Query(default="auto"),
+    variants: List[VariantStyle] = Query(default=["balanced"]),
+    job_title: Optional[str] = None,
+    company: Optional[str] = None,
+    include_cover_letter: bool = False,
+    document_backend: DocumentBackend = Query(default="copy"),
+    idempotency_key: Optional[str] = Header(default=None),
+    timeout_seconds: Optional[float] = Query(default=None, gt=0),
     credentials: Credentials = Depends(get_google_credentials),
 ) -> dict:
     """
     Generate an AI-tailored resume using the TOML data and Gemini AI,
-    then create a Google Doc with the content
+    then create a Google Doc with the content.
+
+    Several languages can be requested at once; the first one is drafted and
+    the others are translated from it, then all documents are created in parallel.
+    ``selection_mode`` picks skills and coursework by keyword matching ("local"),
+    with Gemini ("llm"), or locally unless confidence is low ("auto").
+    Each style in ``variants`` gets its own document in the first language;
+    the variants share the selected skills and coursework and are drafted in
+    parallel, and the other languages are translated from the first variant.
+    ``job_title`` and ``company`` are recorded in the tracking spreadsheet.
+    With ``include_cover_letter`` a cover letter is written from the same
+    content and its document is created alongside the resumes.
+    ``document_backend`` chooses between copying the template and patching it
+    ("copy") or rendering it locally and importing it in one call ("import").
+    Retries carrying the same ``Idempotency-Key`` header get the stored result.
+    If the client disconnects or ``timeout_seconds`` passes, pending Gemini and
+    Drive calls are skipped and a half-created document is deleted. Runs with
+    an ``Idempotency-Key`` only stop at the deadline, so a retry can attach.
     """
+    params = {
+        "job_description": job_description,
+        "language": language,
+        "selection_mode": selection_mode,
+        "variants": variants,
+        "job_title": job_title,
+        "company": company,
+        "include_cover_letter": include_cover_letter,
+        "document_backend": document_backend,
+    }
+    cancellation = CancellationToken(
+        timeout_seconds or get_settings().REQUEST_DEADLINE_SECONDS
+    )
+    # With an idempotency key a retry attaches to this run, so it has to
+    # survive the client going away; only the deadline stops it then
+    watcher = (
+        None
+        if idempotency_key
+        else asyncio.create_task(watch_disconnect(request, cancellation))
+    )
     try:
-        resume_data = load_resume_data(RESUME_DATA_PATH)
+        return await run_in_threadpool(
+            run_idempotent,
+            "resume.generate",
+            idempotency_key,
+            params,
+            lambda: _generate_resume_documents(credentials, cancellation, **params),
+        )
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+
 
-        tailored_content = generate_resume(job_description, resume_data, language)
-        print(tailored_content)
+def _generate_resume_documents(
+    credentials: Credentials,
+    cancellation: CancellationToken,
+    job_description: str,
+    language: List[Language],
+    selection_mode: SelectionMode,
+    variants: List[VariantStyle],
+    job_title: Optional[str],
+    company: Optional[str],
+    include_cover_letter: bool,
+    document_backend: DocumentBackend,
+) -> dict:
+    try:
+        started_at = datetime.now(timezone.utc)
+        timings = {}
+        stage_started = time.perf_counter()
+        resume_data = load_resume_data(RESUME_DATA_PATH)
+        languages = list(dict.fromkeys(language))
+        styles = list(dict.fromkeys(variants))
+        timings["load"] = time.perf_counter() - stage_started
 
-        doc_title = (
-            f"{get_language_name(language)} Resume - {resume_data['personal']['name']}"
+        stage_started = time.perf_counter()
+        primary, *others = languages
+        variant_contents = generate_resume_variants(
+            job_description,
+            resume_data,
+            primary,
+            styles,
+            selection_mode,
+            cancellation,
         )
-        resume_data = ResumeData(
-            title=doc_title,
-            professional_summary=tailored_content.professional_summary.summary,
-            experiences=[
-                exp.formatted_text for exp in tailored_content.selected_experiences
-            ],
-            skills=tailored_content.skills,
-            projects=tailored_content.projects,
-            coursework=tailored_content.coursework,
+        primary_content = variant_contents[styles[0]]
+        tailored_contents = localize_resumes(
+            primary_content, primary, others, cancellation
         )
+        timings["generation"] = time.perf_counter() - stage_started
+        generation_id = uuid.uuid4().hex
 
-        document = create_resume_document(
-            credentials=credentials, resume_data=resume_data, language=language
-        )
-        document_id = document.id
-        return {
+        # One document per variant in the first language, then one per
+        # extra language translated from the first variant. Every variant is
+        # its own generation in the history.
+        targets = [
+            (
+                generation_id if style == styles[0] else f"{generation_id}-{style}",
+                primary,
+                style,
+                variant_contents[style],
+            )
+            for style in styles
+        ]
+        targets += [
+            (generation_id, lang, styles[0], tailored_contents[lang]) for lang in others
+        ]
+
+        # Keep the Gemini output even if creating the documents fails
+        history = get_generation_history()
+        for target_generation_id, lang, _, content in targets:
+            history.record(
+                target_generation_id,
+                lang,
+                job_description,
+                content,
+                timings=timings,
+                job_title=job_title,
+                company=company,
+            )
+
+        def create_target(target: tuple) -> dict:
+            target_generation_id, lang, style, content = target
+            document = _create_resume_document(
+                credentials,
+                content,
+                resume_data,
+                lang,
+                document_backend,
+                batch,
+                style if len(styles) > 1 else None,
+            )
+            document["generation_id"] = target_generation_id
+            return document
+
+        # Lets one failed document stop the rest without cancelling the request
+        batch = cancellation.child()
+        stage_started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(targets) + 1) as executor:
+            futures = [executor.submit(create_target, target) for target in targets]
+            if include_cover_letter:
+                futures.append(
+                    executor.submit(
+                        _create_cover_letter,
+                        credentials,
+                        primary_content,
+                        condense_job_description(job_description),
+                        resume_data,
+                        languages[0],
+                        company,
+                        job_title,
+                        batch,
+                    )
+                )
+            documents = _collect_documents(credentials, futures, batch)
+        cover_letter = documents.pop() if include_cover_letter else None
+        timings["documents"] = time.perf_counter() - stage_started
+
+        for document in documents:
+            history.attach_document(
+                document["generation_id"], document["language"], document, timings
+            )
+
+        tracking_writer = get_tracking_writer()
+        if tracking_writer is not None:
+            for document in documents:
+                tracking_writer.record(
+                    build_tracking_row(
+                        started_at,
+                        job_title,
+                        company,
+                        document["language"],
+                        document,
+                        timings,
+                    )
+                )
+
+        result = {
             "message": "Resume created successfully",
-            "document": {
-                "id": document_id,
-                "title": doc_title,
-                "url": f"https://docs.google.com/document/d/{document_id}/edit",
-            },
+            "generation_id": generation_id,
+            "document": documents[0],
+            "documents": documents,
         }
+        if cover_letter is not None:
+            result["cover_letter"] = cover_letter
+        return result
+    except OperationCancelledError as e:
+        status_code = 504 if e.reason == "deadline exceeded" else 499
+        raise HTTPException(status_code=status_code, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+def _collect_documents(
+    credentials: Credentials,
+    futures: List[Future],
+    batch: CancellationToken,
+) -> List[dict]:
+    """
+    Wait for concurrently created documents and return them in order.
+
+    ``batch`` is the child token the documents are created with. If any of
+    them fails, it stops the others and every document already created is
+    deleted, so a failed request leaves nothing behind in Drive and a retry
+    doesn't produce a second set.
+    """
+    errors = []
+    for future in as_completed(futures):
+        if future.exception() is not None:
+            errors.append(future.exception())
+            batch.cancel("document creation failed")
+    if not errors:
+        return [future.result() for future in futures]
+
+    created = [future.result() for future in futures if future.exception() is None]
+    deleted = sum(
+        discard_document(credentials, document["id"]) for document in created
+    )
+    record_avoided_work(deleted_documents=deleted)
+    raise errors[0]
+
+
+def _create_resume_document(
+    credentials: Credentials,
+    content: ResumeContent,
+    resume_data: dict,
+    language: Language,
+    document_backend: DocumentBackend = "copy",
+    cancellation: Optional[CancellationToken] = None,
+    variant: Optional[VariantStyle] = None,
+) -> dict:
+    """Create the resume document for one language from generated content."""
+    doc_title = (
+        f"{get_language_name(language)} Resume - {resume_data['personal']['name']}"
+    )
+    if variant is not None:
+        doc_title = f"{doc_title} ({variant.capitalize()})"
+    document = create_resume_document(
+        credentials=credentials,
+        resume_data=ResumeData.from_content(doc_title, content),
+        language=language,
+        cancellation=cancellation,
+        backend=document_backend,
+    )
+    result = {"language": language, **document.model_dump()}
+    if variant is not None:
+        result["variant"] = variant
+    return result
+
+
+def _create_cover_letter(
+    credentials: Credentials,
+    content: ResumeContent,
+    job_context: str,
+    resume_data: dict,
+    language: Language,
+    company: Optional[str],
+    job_title: Optional[str],
+    cancellation: Optional[CancellationToken] = None,
+) -> dict:
+    """Write a cover letter from resume content and create its document."""
+    if cancellation is not None:
+        cancellation.raise_if_cancelled(sections=1, drive_calls=2)
+    cover_letter = generate_cover_letter(
+        content, job_context, resume_data, language, company, job_title
+    )
+    doc_title = (
+        f"{get_language_name(language)} Cover Letter - "
+        f"{resume_data['personal']['name']}"
+    )
+    document = create_cover_letter_document(
+        credentials,
+        doc_title,
+        cover_letter.greeting,
+        "\n\n".join(cover_letter.paragraphs),
+        cover_letter.closing,
+        cancellation,
+    )
+    return {"language": language, **document.model_dump()}
+
+
+@router.post("/cover-letter")
+def generate_cover_letter_document(
+    request: CoverLetterRequest,
+    credentials: Credentials = Depends(get_google_credentials),
+) -> dict:
+    """
+    Create a cover letter from an earlier resume generation.
+
+    Reuses the stored resume content and condensed job description, so this
+    costs one Gemini call instead of a full pipeline run.
+    """
+    generation = get_generation_history().get(request.generation_id)
+    if generation is None:
+        raise HTTPException(status_code=404, detail="Generation not found")
+    try:
+        resume_data = load_resume_data(RESUME_DATA_PATH)
+        document = _create_cover_letter(
+            credentials,
+            generation["content"],
+            condense_job_description(generation["job_description"]),
+            resume_data,
+            generation["language"],
+            request.company or generation["company"],
+            request.job_title or generation["job_title"],
+        )
+        return {"message": "Cover letter created successfully", "document": document}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.get("/history/search")
+def search_history(
+    q: Optional[str] = None,
+    company: Optional[str] = None,
+    limit: int = Query(default=20, ge=1, le=100),
+) -> dict:
+    """Search past generations by keyword (full text) and/or company."""
+    return {"results": get_generation_history().search(q, company, limit)}
+
+
+@router.post("/history/{generation_id}/documents")
+def create_document_from_history(
+    generation_id: str,
+    language: Optional[Language] = None,
+    document_backend: DocumentBackend = Query(default="copy"),
+    credentials: Credentials = Depends(get_google_credentials),
+) -> dict:
+    """Create a new document from stored content without calling Gemini again."""
+    generation = get_generation_history().get(generation_id, language)
+    if generation is None:
+        raise HTTPException(status_code=404, detail="Generation not found")
+    try:
+        resume_data = load_resume_data(RESUME_DATA_PATH)
+        document = _create_resume_document(
+            credentials,
+            generation["content"],
+            resume_data,
+            generation["language"],
+            document_backend,
+        )
+        if generation["document_id"] is None:
+            # The original document was never created; this one takes its place
+            get_generation_history().attach_document(
+                generation["generation_id"], generation["language"], document
+            )
+        return {"message": "Resume created successfully", "document": document}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.get("/routes/metrics")
+def get_route_metrics() -> dict:
+    """Latency, token usage and cost per section/model route in this worker."""
+    return {"routes": get_model_router().metrics()}
+
+
+@router.get("/cancellations/metrics")
+def get_cancellation_metrics() -> dict:
+    """Upstream work this worker skipped because requests were cancelled."""
+    return {"cancellations": get_cancellation_stats()}
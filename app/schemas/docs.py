@@ -1,9 +1,13 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class DocumentRequest(BaseModel):
     document_id: str
     user_id: str
+    fields: Optional[str] = None
+    plain_text: bool = False
 
 
 class SheetRequest(BaseModel):
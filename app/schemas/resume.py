@@ -0,0 +1,9 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class CoverLetterRequest(BaseModel):
+    generation_id: str
+    company: Optional[str] = None
+    job_title: Optional[str] = None
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+from fastapi import Request
+
+DISCONNECT_POLL_SECONDS = 0.5
+
+
+class OperationCancelledError(Exception):
+    """Raised at a checkpoint once the request was cancelled."""
+
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(f"Request cancelled: {reason}")
+
+
+@dataclass
+class CancellationStats:
+    cancelled_requests: int = 0
+    skipped_sections: int = 0
+    skipped_drive_calls: int = 0
+    deleted_documents: int = 0
+
+
+_stats = CancellationStats()
+_stats_lock = threading.Lock()
+
+
+def record_avoided_work(
+    sections: int = 0, drive_calls: int = 0, deleted_documents: int = 0
+) -> None:
+    with _stats_lock:
+        _stats.skipped_sections += sections
+        _stats.skipped_drive_calls += drive_calls
+        _stats.deleted_documents += deleted_documents
+
+
+def get_cancellation_stats() -> Dict[str, int]:
+    with _stats_lock:
+        return asdict(_stats)
+
+
+class CancellationToken:
+    """
+    Shared flag telling a running pipeline to stop at its next checkpoint.
+
+    It is set when the client disconnects, and also trips by itself once the
+    optional per-request deadline has passed. A child token follows its parent
+    but can also be cancelled on its own, e.g. to stop sibling tasks after one
+    failed, without counting as a cancelled request.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        parent: Optional["CancellationToken"] = None,
+    ):
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.parent = parent
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+
+    def child(self) -> "CancellationToken":
+        return CancellationToken(parent=self)
+
+    def cancel(self, reason: str) -> None:
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+            if self.parent is None:
+                with _stats_lock:
+                    _stats.cancelled_requests += 1
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._event.is_set():
+            if self.parent is not None and self.parent.cancelled:
+                self.reason = self.parent.reason
+                self._event.set()
+            elif self.deadline is not None and time.monotonic() > self.deadline:
+                self.cancel("deadline exceeded")
+        return self._event.is_set()
+
+    def raise_if_cancelled(self, sections: int = 0, drive_calls: int = 0) -> None:
+        """Stop here if cancelled, counting the upstream work that is skipped."""
+        if self.cancelled:
+            record_avoided_work(sections=sections, drive_calls=drive_calls)
+            raise OperationCancelledError(self.reason)
+
+
+async def watch_disconnect(request: Request, token: CancellationToken) -> None:
+    """Cancel ``token`` as soon as the client of ``request`` goes away."""
+    while not token.cancelled:
+        if await request.is_disconnected():
+            token.cancel("client disconnected")
+            return
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
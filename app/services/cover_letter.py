@@ -0,0 +1,154 @@
+import re
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.services.local_selector import SKILL_ALIASES, count_mentions
+from app.services.resume_generator import ResumeContent, generate_structured
+from app.utils.language import Language, get_language_name
+
+# Phrases that mark the sentences of a job posting worth keeping
+REQUIREMENT_MARKERS = [
+    "experience",
+    "require",
+    "requirements",
+    "responsible",
+    "responsibilities",
+    "you will",
+    "we are looking",
+    "must",
+    "preferred",
+    "qualifications",
+    "mission",
+]
+
+
+class CoverLetter(BaseModel):
+    greeting: str
+    paragraphs: list[str]
+    closing: str
+
+
+class CoverLetterBuilder:
+    # Class constants for configuration
+    MIN_PARAGRAPHS = 3
+    MAX_PARAGRAPHS = 4
+    MAX_WORDS = 350
+
+    def __init__(
+        self,
+        content: ResumeContent,
+        job_context: str,
+        resume_data: Dict,
+        language: Language,
+        company: Optional[str] = None,
+        job_title: Optional[str] = None,
+    ):
+        self.content = content
+        self.job_context = job_context
+        self.resume_data = resume_data
+        self.language = language
+        self.language_name = get_language_name(language)
+        self.company = company
+        self.job_title = job_title
+
+    def validate(self, cover_letter: CoverLetter) -> List[str]:
+        count = len(cover_letter.paragraphs)
+        if self.MIN_PARAGRAPHS <= count <= self.MAX_PARAGRAPHS:
+            return []
+        return [
+            f"paragraphs: expected {self.MIN_PARAGRAPHS}-{self.MAX_PARAGRAPHS} "
+            f"items, got {count}"
+        ]
+
+    def build(self) -> CoverLetter:
+        personal = self.resume_data["personal"]
+        experiences = [exp.formatted_text for exp in self.content.selected_experiences]
+        projects = [project.name for project in self.content.projects.projects]
+        cover_letter_prompt = f"""
+        Write a cover letter in {self.language_name} for {personal["name"]},
+        a {personal["title"]}, applying for {self.job_title or "the role below"}
+        at {self.company or "the company below"}.
+
+        Use only these tailored resume highlights:
+        Summary: {self.content.professional_summary.summary}
+        Experience: {experiences}
+        Skills: {self.content.skills.comma_separated_text}
+        Projects: {projects}
+
+        Key points of the job posting:
+        {self.job_context}
+
+        Requirements:
+        1. {self.MIN_PARAGRAPHS}-{self.MAX_PARAGRAPHS} body paragraphs,
+           no more than {self.MAX_WORDS} words in total
+        2. Connect concrete achievements above to the posting's requirements
+        3. Professional, confident tone without repeating the resume verbatim
+        4. Do not invent experience that isn't listed above
+
+        Format as JSON with this structure:
+        {{
+            "greeting": "Dear Hiring Manager,",
+            "paragraphs": ["First paragraph", "Second paragraph", "Third paragraph"],
+            "closing": "Sincerely,\\n{personal["name"]}"
+        }}
+        """
+
+        return generate_structured(
+            cover_letter_prompt, CoverLetter, "cover_letter", self.validate
+        )
+
+
+def condense_job_description(job_description: str, max_chars: int = 1500) -> str:
+    """
+    Keep the sentences of a job posting that carry requirements or tech names.
+
+    Sentences are ranked by skill and requirement mentions and returned in
+    their original order, so the prompt stays short without another LLM call.
+    """
+    sentences = [
+        sentence.strip()
+        for sentence in re.split(r"(?<=[.!?])\s+|\n+", job_description)
+        if sentence.strip()
+    ]
+    aliases = [alias for names in SKILL_ALIASES.values() for alias in names]
+    scores = {
+        index: count_mentions(sentence, aliases)
+        + count_mentions(sentence, REQUIREMENT_MARKERS)
+        for index, sentence in enumerate(sentences)
+    }
+
+    kept, length = set(), 0
+    for index in sorted(scores, key=lambda index: -scores[index]):
+        if length + len(sentences[index]) > max_chars:
+            continue
+        kept.add(index)
+        length += len(sentences[index]) + 1
+    return " ".join(sentences[index] for index in sorted(kept))
+
+
+def generate_cover_letter(
+    content: ResumeContent,
+    job_context: str,
+    resume_data: Dict,
+    language: Language,
+    company: Optional[str] = None,
+    job_title: Optional[str] = None,
+) -> CoverLetter:
+    """
+    Write a cover letter from already generated resume content.
+
+    Args:
+        content (ResumeContent): Tailored resume content for the same posting
+        job_context (str): Condensed job description
+        resume_data (Dict): The base resume data from TOML config
+        language (Language): Language to write the cover letter in
+        company (str): Optional company name
+        job_title (str): Optional title of the role
+
+    Returns:
+        CoverLetter: Greeting, body paragraphs and closing
+    """
+    return CoverLetterBuilder(
+        content, job_context, resume_data, language, company, job_title
+    ).build()
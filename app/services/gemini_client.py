@@ -1,8 +1,14 @@
-from google import genai
+from functools import lru_cache
 
 from app.config.settings import get_settings
 
-settings = get_settings()
 
+@lru_cache()
+def get_gemini_client():
+    """Create the Gemini client on first use.
 
-client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    The google-genai import is deferred so importing the app stays cheap.
+    """
+    from google import genai
+
+    return genai.Client(api_key=get_settings().GEMINI_API_KEY)
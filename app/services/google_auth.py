@@ -5,12 +5,9 @@ from pathlib import Path
 
 from fastapi import HTTPException
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
 
 from app.config.settings import get_settings
 
-settings = get_settings()
-
 # OAuth 2.0 configuration
 SCOPES = [
     "https://www.googleapis.com/auth/documents",
@@ -19,8 +16,11 @@ SCOPES = [
 ]
 
 
-def get_flow() -> Flow:
+def get_flow():
     """Create and return an OAuth flow instance."""
+    from google_auth_oauthlib.flow import Flow
+
+    settings = get_settings()
     client_config = {
         "web": {
             "client_id": settings.GOOGLE_CLIENT_ID,
@@ -47,17 +47,25 @@ def get_authorization_url() -> str:
     return authorization_url
 
 
-@lru_cache()
+@lru_cache(maxsize=4)
+def _read_credentials_config(path: Path, mtime_ns: int, size: int):
+    # The file's mtime and size are part of the key, so edits are picked up
+    with open(path, "r") as f:
+        return json.load(f)
+
+
 def get_credentials_config():
-    """Load credentials configuration from file."""
+    """Load credentials configuration from file, re-reading it when it changes."""
     try:
         credentials_path = Path("credentials/google_credentials.json")
 
         if not credentials_path.exists():
             raise FileNotFoundError("Credentials file not found in credentials folder")
 
-        with open(credentials_path, "r") as f:
-            return json.load(f)
+        stat = credentials_path.stat()
+        return _read_credentials_config(
+            credentials_path, stat.st_mtime_ns, stat.st_size
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -83,7 +91,7 @@ async def get_google_credentials() -> Credentials:
     Used for authenticated endpoints.
     """
     try:
-        user_id = settings.TEST_USER_EMAIL
+        user_id = get_settings().TEST_USER_EMAIL
         return load_credentials(user_id)
     except Exception as e:
         raise HTTPException(
@@ -1,21 +1,39 @@
+import html
+import json
+import logging
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from fastapi import Depends, HTTPException
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from pydantic import BaseModel
 
+from app.services.cancellation import (
+    CancellationToken,
+    OperationCancelledError,
+    record_avoided_work,
+)
 from app.services.google_auth import get_google_credentials
 from app.services.resume_generator import (
     CourseworkSection,
     ProjectsSection,
+    ResumeContent,
     SkillsSection,
 )
+from app.services.shared_state import TEMPLATES_NAMESPACE, get_shared_state
 from app.utils.language import Language
-from app.config.settings import get_template_settings
+from app.config.settings import get_settings, get_template_settings
+
+logger = logging.getLogger(__name__)
 
-template_settings = get_template_settings()
+# "copy": files.copy of the template, then a replaceAllText batchUpdate
+# "import": fill a cached HTML export locally and upload it with files.create
+DocumentBackend = Literal["copy", "import"]
+
+GOOGLE_DOC_MIME_TYPE = "application/vnd.google-apps.document"
 
 
 class ResumeDocument(BaseModel):
@@ -33,17 +51,188 @@ class ResumeData:
     projects: ProjectsSection
     coursework: CourseworkSection
 
+    @classmethod
+    def from_content(cls, title: str, content: ResumeContent) -> "ResumeData":
+        return cls(
+            title=title,
+            professional_summary=content.professional_summary.summary,
+            experiences=[exp.formatted_text for exp in content.selected_experiences],
+            skills=content.skills,
+            projects=content.projects,
+            coursework=content.coursework,
+        )
+
+
+def get_template_id(language: Language) -> str:
+    """Korean resumes use their own template; every other language the default."""
+    template_settings = get_template_settings()
+    return (
+        template_settings.KOREAN_TEMPLATE_ID
+        if language == "kr"
+        else template_settings.TEMPLATE_ID
+    )
+
+
+@lru_cache()
+def get_discovery_document(service_name: str, version: str) -> str:
+    """Load a bundled discovery document once per process."""
+    from googleapiclient.discovery_cache import get_static_doc
+
+    document = get_static_doc(service_name, version)
+    if document is None:
+        raise ValueError(f"No discovery document for {service_name} {version}")
+    return document
+
+
+def build_service(service_name: str, version: str, credentials: Credentials):
+    """Build a Google API client from the cached discovery document."""
+    from googleapiclient.discovery import build_from_document
+
+    return build_from_document(
+        get_discovery_document(service_name, version), credentials=credentials
+    )
+
 
 def get_docs_service(credentials: Credentials = Depends(get_google_credentials)):
     """Create and return a Google Docs service instance."""
-    return build("docs", "v1", credentials=credentials)
+    return build_service("docs", "v1", credentials)
+
+
+# Field mask that fetches only what plain-text extraction needs
+PLAIN_TEXT_FIELDS = (
+    "documentId,title,revisionId,"
+    "body/content(paragraph/elements/textRun/content,"
+    "table/tableRows/tableCells/content/paragraph/elements/textRun/content)"
+)
+
+
+class DocumentReadCache:
+    """Small LRU cache of document reads keyed by document id and projection.
+
+    Each entry remembers the Drive file ``version`` it was read at, so a cheap
+    metadata lookup tells whether it is still current. Entries are also capped
+    by their serialized size, and documents larger than the whole budget are
+    not cached at all.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, Optional[str], bool], Dict]" = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._lock = Lock()
+
+    def get(
+        self,
+        document_id: str,
+        fields: Optional[str],
+        plain_text: bool,
+        version: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
+        key = (document_id, fields, plain_text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or version is None or entry["version"] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry["document"]
+
+    def put(
+        self,
+        document_id: str,
+        fields: Optional[str],
+        plain_text: bool,
+        version: Optional[str],
+        document: Dict[str, Any],
+    ) -> None:
+        key = (document_id, fields, plain_text)
+        size = len(json.dumps(document))
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous["size"]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = {
+                "version": version,
+                "document": document,
+                "size": size,
+            }
+            self._size += size
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted["size"]
 
 
-def read_document(credentials: Credentials, document_id: str) -> Dict[str, Any]:
-    """Read content from a Google Doc."""
+document_read_cache = DocumentReadCache()
+
+
+def get_drive_service(credentials: Credentials):
+    """Create and return a Google Drive service instance."""
+    return build_service("drive", "v3", credentials)
+
+
+def _extract_text(content: List[Dict[str, Any]]) -> str:
+    """Flatten structural elements of a Docs body into plain text."""
+    chunks = []
+    for element in content:
+        paragraph = element.get("paragraph")
+        if paragraph:
+            for run in paragraph.get("elements", []):
+                chunks.append(run.get("textRun", {}).get("content", ""))
+        table = element.get("table")
+        if table:
+            for row in table.get("tableRows", []):
+                for cell in row.get("tableCells", []):
+                    chunks.append(_extract_text(cell.get("content", [])))
+    return "".join(chunks)
+
+
+def read_document(
+    credentials: Credentials,
+    document_id: str,
+    fields: Optional[str] = None,
+    plain_text: bool = False,
+) -> Dict[str, Any]:
+    """Read content from a Google Doc.
+
+    Args:
+        credentials: Google OAuth credentials
+        document_id: ID of the document to read
+        fields: Optional field mask limiting which parts of the document are returned
+        plain_text: Return only the document text instead of the Docs JSON tree
+    """
     try:
+        if plain_text and fields is None:
+            fields = PLAIN_TEXT_FIELDS
+
+        # Drive metadata is a tiny response; use it to skip unchanged documents
+        drive_service = get_drive_service(credentials)
+        version = (
+            drive_service.files()
+            .get(fileId=document_id, fields="version")
+            .execute()
+            .get("version")
+        )
+        cached = document_read_cache.get(document_id, fields, plain_text, version)
+        if cached is not None:
+            return cached
+
         service = get_docs_service(credentials)
-        document = service.documents().get(documentId=document_id).execute()
+        document = (
+            service.documents().get(documentId=document_id, fields=fields).execute()
+        )
+        if plain_text:
+            document = {
+                "documentId": document_id,
+                "title": document.get("title"),
+                "revisionId": document.get("revisionId"),
+                "text": _extract_text(document.get("body", {}).get("content", [])),
+            }
+
+        document_read_cache.put(document_id, fields, plain_text, version, document)
         return document
     except Exception as e:
         raise HTTPException(
@@ -66,7 +255,7 @@ def create_document(
     """
     try:
         service = get_docs_service(credentials)
-        drive_service = build("drive", "v3", credentials=credentials)
+        drive_service = get_drive_service(credentials)
 
         if template_id:
             # Copy from template using Drive API
@@ -86,6 +275,26 @@ def create_document(
         ) from e
 
 
+def delete_document(credentials: Credentials, document_id: str) -> None:
+    """Delete a Google Doc through the Drive API."""
+    try:
+        get_drive_service(credentials).files().delete(fileId=document_id).execute()
+    except Exception as e:
+        raise HTTPException(
+            status_code=400, detail=f"Failed to delete document: {str(e)}"
+        ) from e
+
+
+def discard_document(credentials: Credentials, document_id: str) -> bool:
+    """Delete a half-created document, logging instead of raising on failure."""
+    try:
+        delete_document(credentials, document_id)
+        return True
+    except HTTPException as e:
+        logger.warning("Failed to delete document %s: %s", document_id, e.detail)
+        return False
+
+
 def update_document(credentials: Credentials, document_id: str, content: str) -> None:
     """Update content in a Google Doc."""
     try:
@@ -100,18 +309,111 @@ def update_document(credentials: Credentials, document_id: str, content: str) ->
         ) from e
 
 
+def get_template_html(credentials: Credentials, template_id: str) -> str:
+    """
+    Export a template as HTML, cached in the shared store across workers.
+
+    The cache is keyed by the template's Drive ``version``, so an edited
+    template is exported again and "import" renders the same template as "copy".
+    """
+    drive_service = get_drive_service(credentials)
+    version = (
+        drive_service.files()
+        .get(fileId=template_id, fields="version")
+        .execute()
+        .get("version")
+    )
+    store = get_shared_state()
+    cache_key = f"html:{template_id}:{version}"
+    cached = store.get(TEMPLATES_NAMESPACE, cache_key)
+    if cached is not None:
+        return cached
+    exported = (
+        drive_service.files().export(fileId=template_id, mimeType="text/html").execute()
+    )
+    template_html = exported.decode("utf-8")
+    store.set(
+        TEMPLATES_NAMESPACE,
+        cache_key,
+        template_html,
+        ttl=get_settings().TEMPLATE_MANIFEST_TTL_SECONDS,
+    )
+    return template_html
+
+
+class TemplatePlaceholderError(ValueError):
+    """Raised when exported template HTML lacks placeholders to replace."""
+
+    def __init__(self, missing: List[str]):
+        self.missing = missing
+        super().__init__(f"Placeholders not found in template HTML: {missing}")
+
+
+def render_template_html(template_html: str, requests: List[Dict[str, Any]]) -> str:
+    """
+    Apply replaceAllText requests to template HTML locally.
+
+    Drive's HTML export can split a placeholder across ``<span>`` elements or
+    encode its braces, in which case it can't be replaced textually; every
+    placeholder is checked first and ``TemplatePlaceholderError`` lists those
+    that are missing.
+    """
+    placeholders = [
+        html.escape(request["replaceAllText"]["containsText"]["text"], quote=False)
+        for request in requests
+    ]
+    missing = [
+        placeholder for placeholder in placeholders if placeholder not in template_html
+    ]
+    if missing:
+        raise TemplatePlaceholderError(missing)
+    for placeholder, request in zip(placeholders, requests, strict=True):
+        replacement = html.escape(
+            request["replaceAllText"]["replaceText"], quote=False
+        ).replace("\n", "<br>")
+        template_html = template_html.replace(placeholder, replacement)
+    return template_html
+
+
+def import_document(credentials: Credentials, title: str, document_html: str) -> str:
+    """Upload HTML as a new Google Doc in a single files.create call."""
+    from googleapiclient.http import MediaInMemoryUpload
+
+    try:
+        created = (
+            get_drive_service(credentials)
+            .files()
+            .create(
+                body={"name": title, "mimeType": GOOGLE_DOC_MIME_TYPE},
+                media_body=MediaInMemoryUpload(
+                    document_html.encode("utf-8"), mimetype="text/html"
+                ),
+                fields="id",
+            )
+            .execute()
+        )
+        return created.get("id")
+    except Exception as e:
+        raise HTTPException(
+            status_code=400, detail=f"Failed to import document: {str(e)}"
+        ) from e
+
+
 class ResumeDocumentBuilder:
-    def __init__(self, credentials: Credentials, title: str, language: Language):
+    def __init__(
+        self,
+        credentials: Credentials,
+        title: str,
+        language: Language,
+        cancellation: Optional[CancellationToken] = None,
+        backend: DocumentBackend = "copy",
+    ):
         self.credentials = credentials
         self.title = title
-        self.template_id = (
-            template_settings.TEMPLATE_ID
-            if language == "en"
-            else template_settings.KOREAN_TEMPLATE_ID
-        )
+        self.cancellation = cancellation
+        self.backend = backend
+        self.template_id = get_template_id(language)
         self.requests = []
-        self.service = get_docs_service(credentials)
-        self.document_id = create_document(credentials, title, self.template_id)
 
     def add_professional_summary(self, summary: str) -> "ResumeDocumentBuilder":
         self.requests.append(
@@ -247,29 +549,74 @@ class ResumeDocumentBuilder:
         )
         return self
 
+    def _document(self, document_id: str) -> ResumeDocument:
+        return ResumeDocument(
+            id=document_id,
+            title=self.title,
+            url=f"https://docs.google.com/document/d/{document_id}/edit",
+        )
+
+    def _build_by_import(self) -> ResumeDocument:
+        if self.cancellation is not None:
+            # Skips the template version lookup and the import
+            self.cancellation.raise_if_cancelled(drive_calls=2)
+        try:
+            document_html = render_template_html(
+                get_template_html(self.credentials, self.template_id), self.requests
+            )
+        except TemplatePlaceholderError as e:
+            # The document would keep raw placeholders; let Docs replace them
+            logger.warning(
+                "Template %s can't be imported, copying it instead: %s",
+                self.template_id,
+                e,
+            )
+            return self._build_by_copy()
+        return self._document(
+            import_document(self.credentials, self.title, document_html)
+        )
+
     def build(self) -> ResumeDocument:
+        if self.backend == "import":
+            return self._build_by_import()
+        return self._build_by_copy()
+
+    def _build_by_copy(self) -> ResumeDocument:
+        if self.cancellation is not None:
+            # Skips both the template copy and the batchUpdate
+            self.cancellation.raise_if_cancelled(drive_calls=2)
+        document_id = create_document(self.credentials, self.title, self.template_id)
+        if self.cancellation is not None and self.cancellation.cancelled:
+            # Nobody will see the copied template, so don't leave it in Drive
+            delete_document(self.credentials, document_id)
+            record_avoided_work(drive_calls=1, deleted_documents=1)
+            raise OperationCancelledError(self.cancellation.reason)
         try:
-            self.service.documents().batchUpdate(
-                documentId=self.document_id, body={"requests": self.requests}
+            get_docs_service(self.credentials).documents().batchUpdate(
+                documentId=document_id, body={"requests": self.requests}
             ).execute()
 
-            return ResumeDocument(
-                id=self.document_id,
-                title=self.title,
-                url=f"https://docs.google.com/document/d/{self.document_id}/edit",
-            )
+            return self._document(document_id)
         except Exception as e:
+            # The copy still holds raw placeholders; don't leave it in Drive
+            discard_document(self.credentials, document_id)
             raise HTTPException(
                 status_code=400, detail=f"Failed to create resume document: {str(e)}"
             ) from e
 
 
 def create_resume_document(
-    credentials: Credentials, resume_data: ResumeData, language: Language
+    credentials: Credentials,
+    resume_data: ResumeData,
+    language: Language,
+    cancellation: Optional[CancellationToken] = None,
+    backend: DocumentBackend = "copy",
 ) -> ResumeDocument:
     """Create a new Google Doc with resume content, optionally from a template."""
     return (
-        ResumeDocumentBuilder(credentials, resume_data.title, language)
+        ResumeDocumentBuilder(
+            credentials, resume_data.title, language, cancellation, backend
+        )
         .add_professional_summary(resume_data.professional_summary)
         .add_experiences(resume_data.experiences)
         .add_skills(resume_data.skills)
@@ -277,3 +624,56 @@ def create_resume_document(
         .add_coursework(resume_data.coursework)
         .build()
     )
+
+
+def create_cover_letter_document(
+    credentials: Credentials,
+    title: str,
+    greeting: str,
+    body: str,
+    closing: str,
+    cancellation: Optional[CancellationToken] = None,
+) -> ResumeDocument:
+    """Create a cover letter Google Doc from the template, or a blank document."""
+    if cancellation is not None:
+        cancellation.raise_if_cancelled(drive_calls=2)
+    template_id = get_template_settings().COVER_LETTER_TEMPLATE_ID
+    document_id = create_document(credentials, title, template_id)
+    if template_id:
+        requests = [
+            {
+                "replaceAllText": {
+                    "containsText": {
+                        "text": f"{{{{cover_letter_{name}_placeholder}}}}"
+                    },
+                    "replaceText": text,
+                }
+            }
+            for name, text in (
+                ("greeting", greeting),
+                ("body", body),
+                ("closing", closing),
+            )
+        ]
+    else:
+        text = "\n\n".join([greeting, body, closing])
+        requests = [{"insertText": {"location": {"index": 1}, "text": text}}]
+
+    if cancellation is not None and cancellation.cancelled:
+        delete_document(credentials, document_id)
+        record_avoided_work(drive_calls=1, deleted_documents=1)
+        raise OperationCancelledError(cancellation.reason)
+    try:
+        get_docs_service(credentials).documents().batchUpdate(
+            documentId=document_id, body={"requests": requests}
+        ).execute()
+        return ResumeDocument(
+            id=document_id,
+            title=title,
+            url=f"https://docs.google.com/document/d/{document_id}/edit",
+        )
+    except Exception as e:
+        discard_document(credentials, document_id)
+        raise HTTPException(
+            status_code=400, detail=f"Failed to create cover letter: {str(e)}"
+        ) from e
@@ -0,0 +1,254 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+from google.oauth2.credentials import Credentials
+
+from app.config.settings import get_settings
+from app.services.google_auth import load_credentials
+from app.services.google_docs import build_service
+
+logger = logging.getLogger(__name__)
+
+TRACKING_HEADER = [
+    "Recorded At",
+    "Started At",
+    "Job Title",
+    "Company",
+    "Language",
+    "Document Title",
+    "Document URL",
+    "Load Seconds",
+    "Generation Seconds",
+    "Document Seconds",
+    "Total Seconds",
+]
+
+
+def get_sheets_service(credentials: Credentials):
+    """Create and return a Google Sheets service instance."""
+    return build_service("sheets", "v4", credentials)
+
+
+def read_values(
+    credentials: Credentials, spreadsheet_id: str, range_name: str
+) -> List[List[Any]]:
+    """Read cell values from a spreadsheet range."""
+    try:
+        service = get_sheets_service(credentials)
+        result = (
+            service.spreadsheets()
+            .values()
+            .get(spreadsheetId=spreadsheet_id, range=range_name)
+            .execute()
+        )
+        return result.get("values", [])
+    except Exception as e:
+        raise HTTPException(
+            status_code=400, detail=f"Failed to read spreadsheet: {str(e)}"
+        ) from e
+
+
+def append_rows(
+    credentials: Credentials,
+    spreadsheet_id: str,
+    range_name: str,
+    rows: List[List[Any]],
+) -> None:
+    """Append rows to a spreadsheet range in a single request."""
+    service = get_sheets_service(credentials)
+    service.spreadsheets().values().append(
+        spreadsheetId=spreadsheet_id,
+        range=range_name,
+        valueInputOption="USER_ENTERED",
+        insertDataOption="INSERT_ROWS",
+        body={"values": rows},
+    ).execute()
+
+
+def get_sheet_titles(credentials: Credentials, spreadsheet_id: str) -> List[str]:
+    """List the titles of the tabs in a spreadsheet."""
+    service = get_sheets_service(credentials)
+    spreadsheet = (
+        service.spreadsheets()
+        .get(spreadsheetId=spreadsheet_id, fields="sheets.properties.title")
+        .execute()
+    )
+    return [sheet["properties"]["title"] for sheet in spreadsheet.get("sheets", [])]
+
+
+def build_tracking_row(
+    started_at: datetime,
+    job_title: Optional[str],
+    company: Optional[str],
+    language: str,
+    document: Dict[str, Any],
+    timings: Dict[str, float],
+) -> List[Any]:
+    """Format one generated resume as a row matching ``TRACKING_HEADER``."""
+    return [
+        datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        started_at.isoformat(timespec="seconds"),
+        job_title or "",
+        company or "",
+        language,
+        document["title"],
+        document["url"],
+        round(timings.get("load", 0.0), 3),
+        round(timings.get("generation", 0.0), 3),
+        round(timings.get("documents", 0.0), 3),
+        round(sum(timings.values()), 3),
+    ]
+
+
+class SheetsTrackingWriter:
+    """
+    Buffer tracking rows and append them to a spreadsheet in the background.
+
+    Rows are flushed with one ``values.append`` call every flush interval, or
+    sooner once ``max_batch_rows`` are waiting, so request handlers never wait
+    on Sheets. Failed flushes are retried with backoff and then kept in the
+    buffer for the next round. If the tab named in ``range_name`` doesn't
+    exist, the writer logs an error and disables itself.
+    """
+
+    def __init__(
+        self,
+        spreadsheet_id: str,
+        range_name: str,
+        flush_interval: float,
+        max_batch_rows: int,
+        max_retries: int,
+        max_buffered_rows: int = 10_000,
+    ):
+        self.spreadsheet_id = spreadsheet_id
+        self.range_name = range_name
+        self.flush_interval = flush_interval
+        self.max_batch_rows = max_batch_rows
+        self.max_retries = max_retries
+        self.max_buffered_rows = max_buffered_rows
+        self._rows: List[List[Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sheet_checked = False
+        self._disabled = False
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="sheets-tracking", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def record(self, row: List[Any]) -> None:
+        if self._disabled:
+            return
+        with self._lock:
+            self._rows.append(row)
+            if len(self._rows) > self.max_buffered_rows:
+                dropped = len(self._rows) - self.max_buffered_rows
+                del self._rows[:dropped]
+                logger.warning("Dropped %d tracking rows; buffer is full", dropped)
+            if len(self._rows) >= self.max_batch_rows:
+                self._wake.set()
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return
+            if not self._append_with_retry(rows):
+                with self._lock:
+                    self._rows = rows + self._rows
+
+    def _append_with_retry(self, rows: List[List[Any]]) -> bool:
+        for attempt in range(self.max_retries):
+            try:
+                credentials = load_credentials(get_settings().TEST_USER_EMAIL)
+                values = rows
+                if not self._sheet_checked:
+                    if not self._sheet_exists(credentials):
+                        self._disable()
+                        # Report the rows as handled so they aren't requeued
+                        return True
+                    if not self._has_header(credentials):
+                        values = [TRACKING_HEADER] + rows
+                append_rows(credentials, self.spreadsheet_id, self.range_name, values)
+                self._sheet_checked = True
+                return True
+            except Exception as e:
+                logger.warning(
+                    "Tracking append of %d rows failed (attempt %d): %s",
+                    len(rows),
+                    attempt + 1,
+                    e,
+                )
+                if attempt + 1 < self.max_retries:
+                    time.sleep(2**attempt)
+        return False
+
+    def _sheet_name(self) -> Optional[str]:
+        if "!" not in self.range_name:
+            return None
+        return self.range_name.rsplit("!", 1)[0]
+
+    def _sheet_exists(self, credentials: Credentials) -> bool:
+        sheet_name = self._sheet_name()
+        # A range without a tab name writes to the first tab, which always exists
+        if sheet_name is None:
+            return True
+        titles = get_sheet_titles(credentials, self.spreadsheet_id)
+        return sheet_name.strip("'").replace("''", "'") in titles
+
+    def _disable(self) -> None:
+        self._disabled = True
+        with self._lock:
+            self._rows.clear()
+        logger.error(
+            "Application tracking disabled: spreadsheet %s has no tab named %r. "
+            "Create the tab or point TRACKING_SHEET_RANGE at an existing one.",
+            self.spreadsheet_id,
+            self._sheet_name(),
+        )
+
+    def _has_header(self, credentials: Credentials) -> bool:
+        sheet_name = self._sheet_name()
+        header_range = f"{sheet_name}!1:1" if sheet_name else "1:1"
+        return bool(read_values(credentials, self.spreadsheet_id, header_range))
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+@lru_cache()
+def get_tracking_writer() -> Optional[SheetsTrackingWriter]:
+    """Return the process-wide tracking writer, or None when tracking is off."""
+    settings = get_settings()
+    if not settings.TRACKING_SPREADSHEET_ID:
+        return None
+    return SheetsTrackingWriter(
+        spreadsheet_id=settings.TRACKING_SPREADSHEET_ID,
+        range_name=settings.TRACKING_SHEET_RANGE,
+        flush_interval=settings.TRACKING_FLUSH_INTERVAL_SECONDS,
+        max_batch_rows=settings.TRACKING_MAX_BATCH_ROWS,
+        max_retries=settings.TRACKING_MAX_RETRIES,
+    )
@@ -0,0 +1,233 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import get_settings
+from app.services.resume_generator import ResumeContent
+
+# Columns of the FTS index, in the order used by snippet()
+FTS_COLUMNS = ["job_title", "company", "job_description", "content_text"]
+
+
+def _content_text(content: ResumeContent) -> str:
+    """Flatten the prose of generated content for full-text indexing."""
+    parts = [content.professional_summary.summary]
+    parts += [exp.formatted_text for exp in content.selected_experiences]
+    parts += [content.skills.summary_text, content.skills.comma_separated_text]
+    for project in content.projects.projects:
+        parts += [project.name, *project.formatted_bullets]
+    parts.append(content.coursework.comma_separated_text)
+    return "\n".join(parts)
+
+
+def _match_query(query: str) -> str:
+    """Quote each search term so user input can't break FTS5 syntax."""
+    terms = query.split()
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+class GenerationHistory:
+    """
+    Persistent record of every generated resume, searchable with FTS5.
+
+    One row is stored per generation and language, holding the job
+    description, the per-section content, the created document and stage
+    timings. Content is recorded as soon as it is generated and the document
+    attached once it exists, so a failed Drive call doesn't lose the Gemini
+    output. Old rows are compacted away by age and count on every write.
+    """
+
+    def __init__(self, path: str, max_entries: int, max_age_days: int):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS generations (
+                generation_id TEXT NOT NULL,
+                language TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                job_title TEXT,
+                company TEXT,
+                job_description TEXT NOT NULL,
+                content TEXT NOT NULL,
+                document_id TEXT,
+                document_url TEXT,
+                timings TEXT,
+                PRIMARY KEY (generation_id, language)
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS generations_created_at "
+            "ON generations (created_at)"
+        )
+        conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS generations_fts "
+            f"USING fts5({', '.join(FTS_COLUMNS)})"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def record(
+        self,
+        generation_id: str,
+        language: str,
+        job_description: str,
+        content: ResumeContent,
+        document: Optional[Dict[str, Any]] = None,
+        timings: Optional[Dict[str, float]] = None,
+        job_title: Optional[str] = None,
+        company: Optional[str] = None,
+    ) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Re-recording a generation replaces its row, so drop the old index entry
+            conn.execute(
+                "DELETE FROM generations_fts WHERE rowid IN (SELECT rowid FROM "
+                "generations WHERE generation_id = ? AND language = ?)",
+                (generation_id, language),
+            )
+            cursor = conn.execute(
+                "INSERT OR REPLACE INTO generations (generation_id, language, "
+                "created_at, job_title, company, job_description, content, "
+                "document_id, document_url, timings) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    generation_id,
+                    language,
+                    time.time(),
+                    job_title,
+                    company,
+                    job_description,
+                    content.model_dump_json(),
+                    document["id"] if document else None,
+                    document["url"] if document else None,
+                    json.dumps(timings or {}),
+                ),
+            )
+            conn.execute(
+                f"INSERT INTO generations_fts (rowid, {', '.join(FTS_COLUMNS)}) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    cursor.lastrowid,
+                    job_title or "",
+                    company or "",
+                    job_description,
+                    _content_text(content),
+                ),
+            )
+            self._compact(conn)
+
+    def attach_document(
+        self,
+        generation_id: str,
+        language: str,
+        document: Dict[str, Any],
+        timings: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """Store the document created from a recorded generation."""
+        assignments = "document_id = ?, document_url = ?"
+        params: list = [document["id"], document["url"]]
+        if timings is not None:
+            assignments += ", timings = ?"
+            params.append(json.dumps(timings))
+        self._connection().execute(
+            f"UPDATE generations SET {assignments} "
+            "WHERE generation_id = ? AND language = ?",
+            (*params, generation_id, language),
+        )
+
+    def _compact(self, conn: sqlite3.Connection) -> None:
+        cutoff = time.time() - self.max_age_days * 24 * 60 * 60
+        too_old = conn.execute(
+            "SELECT rowid FROM generations WHERE created_at < ?", (cutoff,)
+        ).fetchall()
+        over_limit = conn.execute(
+            "SELECT rowid FROM generations "
+            "ORDER BY created_at DESC LIMIT -1 OFFSET ?",
+            (self.max_entries,),
+        ).fetchall()
+        rowids = [(rowid,) for rowid in {row[0] for row in too_old + over_limit}]
+        conn.executemany("DELETE FROM generations WHERE rowid = ?", rowids)
+        conn.executemany("DELETE FROM generations_fts WHERE rowid = ?", rowids)
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        company: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """Find past generations by keyword and/or company, best matches first."""
+        conditions, params = [], []
+        if query and query.strip():
+            source = (
+                "generations_fts JOIN generations g "
+                "ON g.rowid = generations_fts.rowid"
+            )
+            snippet = "snippet(generations_fts, -1, '[', ']', '...', 12)"
+            conditions.append("generations_fts MATCH ?")
+            params.append(_match_query(query))
+            order = "generations_fts.rank"
+        else:
+            source, snippet, order = "generations g", "NULL", "g.created_at DESC"
+        if company:
+            conditions.append("g.company LIKE ?")
+            params.append(f"%{company}%")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._connection().execute(
+            f"SELECT g.generation_id, g.language, g.created_at, g.job_title, "
+            f"g.company, g.document_id, g.document_url, {snippet} AS snippet "
+            f"FROM {source} {where} ORDER BY {order} LIMIT ?",
+            (*params, limit),
+        )
+        return [dict(row) for row in rows]
+
+    def get(
+        self, generation_id: str, language: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Load a stored generation; without a language, the primary one."""
+        sql = "SELECT * FROM generations WHERE generation_id = ?"
+        params: list = [generation_id]
+        if language:
+            sql += " AND language = ?"
+            params.append(language)
+        row = (
+            self._connection()
+            .execute(sql + " ORDER BY rowid LIMIT 1", params)
+            .fetchone()
+        )
+        if row is None:
+            return None
+        generation = dict(row)
+        generation["content"] = ResumeContent.model_validate_json(row["content"])
+        generation["timings"] = json.loads(row["timings"] or "{}")
+        return generation
+
+
+@lru_cache()
+def get_generation_history() -> GenerationHistory:
+    settings = get_settings()
+    return GenerationHistory(
+        settings.HISTORY_DB_PATH,
+        settings.HISTORY_MAX_ENTRIES,
+        settings.HISTORY_MAX_AGE_DAYS,
+    )
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+from app.config.settings import get_settings
+from app.services.shared_state import JOBS_NAMESPACE, get_shared_state
+
+POLL_INTERVAL_SECONDS = 0.5
+
+
+def _fingerprint(params: Dict[str, Any]) -> str:
+    return hashlib.sha256(
+        json.dumps(params, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def run_idempotent(
+    scope: str,
+    idempotency_key: Optional[str],
+    params: Dict[str, Any],
+    func: Callable[[], Any],
+) -> Any:
+    """
+    Run ``func`` at most once per idempotency key.
+
+    The first request claims the key in the shared store and saves its result
+    there. A repeated key returns the saved result or, while the first run is
+    still going, waits for it instead of starting new work. A failed run
+    releases the key so the client can retry. Reusing a key with different
+    parameters is rejected.
+
+    Args:
+        scope: Name of the operation, so keys of different endpoints don't clash
+        idempotency_key: Value of the ``Idempotency-Key`` header, if any
+        params: Request parameters the key is bound to
+        func: The work to run; its result must be JSON serialisable
+    """
+    if not idempotency_key:
+        return func()
+
+    settings = get_settings()
+    store = get_shared_state()
+    store_key = f"{scope}:{idempotency_key}"
+    fingerprint = _fingerprint(params)
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+
+    while True:
+        claimed = store.claim(
+            JOBS_NAMESPACE,
+            store_key,
+            {"status": "in_progress", "fingerprint": fingerprint, "pid": os.getpid()},
+            ttl=settings.IDEMPOTENCY_IN_PROGRESS_TTL_SECONDS,
+        )
+        if claimed:
+            break
+
+        entry = store.get(JOBS_NAMESPACE, store_key)
+        if entry is None:
+            # Released by a failed run or expired; try to claim it ourselves
+            continue
+        if entry["fingerprint"] != fingerprint:
+            raise HTTPException(
+                status_code=422,
+                detail="Idempotency-Key was already used with different parameters",
+            )
+        if entry["status"] == "completed":
+            return entry["result"]
+        if time.monotonic() > deadline:
+            raise HTTPException(
+                status_code=409,
+                detail="A request with this Idempotency-Key is still in progress",
+            )
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+    try:
+        result = func()
+    except BaseException:
+        store.delete(JOBS_NAMESPACE, store_key)
+        raise
+    store.set(
+        JOBS_NAMESPACE,
+        store_key,
+        {"status": "completed", "fingerprint": fingerprint, "result": result},
+        ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+    )
+    return result
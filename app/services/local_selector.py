@@ -0,0 +1,149 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Literal
+
+# "llm": always ask Gemini, "local": always use keyword matching,
+# "auto": keyword matching unless its confidence is too low
+SelectionMode = Literal["llm", "local", "auto"]
+
+# Canonical names from the TOML mapped to spellings found in job descriptions.
+# Aliases containing capitals are matched case-sensitively, so acronyms that
+# are also ordinary words ("REST", "Lambda") only match when written as such.
+SKILL_ALIASES: Dict[str, List[str]] = {
+    "AWS": ["aws", "amazon web services", "EC2", "S3", "Lambda"],
+    "GCP": ["gcp", "google cloud", "google cloud platform"],
+    "Docker": ["docker", "container", "containers", "containerization"],
+    "Docker Compose": ["docker compose", "docker-compose"],
+    "Kubernetes": ["kubernetes", "k8s", "kube", "helm", "EKS", "GKE"],
+    "Git": ["git", "version control"],
+    "Github": ["github", "github actions"],
+    "Gitlab": ["gitlab", "gitlab ci"],
+    "PostgreSQL": ["postgresql", "postgres", "psql"],
+    "Redis": ["redis"],
+    "Linux": ["linux", "unix", "ubuntu", "debian"],
+    "VSCode": ["vscode", "vs code", "visual studio code"],
+    "Figma": ["figma"],
+    "gcc": ["gcc"],
+    "Jira": ["jira"],
+    "Agile": ["agile"],
+    "Scrum": ["scrum", "sprint planning", "sprints"],
+    "openSSL": ["openssl"],
+    "JWT": ["jwt", "json web token", "json web tokens"],
+    "OAuth 2.0": ["oauth", "oauth2", "oauth 2.0", "oidc", "openid connect"],
+    "TLS": ["tls", "ssl", "https"],
+    "REST": ["REST", "restful", "rest api", "rest apis"],
+    "WebSocket": ["websocket", "websockets"],
+    "gRPC": ["grpc"],
+    "Google Protobuf": ["protobuf", "protocol buffers"],
+}
+
+# Topics that make a course relevant to a job description
+COURSEWORK_KEYWORDS: Dict[str, List[str]] = {
+    "Data Structures and Algorithms": ["data structures", "algorithms", "algorithm"],
+    "Operating Systems": ["operating system", "operating systems", "kernel", "linux"],
+    "Software Engineering": [
+        "software engineering",
+        "software architecture",
+        "unit testing",
+        "test-driven",
+        "design patterns",
+    ],
+    "Introduction to Algorithms": ["algorithms", "algorithm", "time complexity"],
+    "Programming Principles": [
+        "clean code",
+        "object-oriented",
+        "functional programming",
+    ],
+    "Introduction to Artificial Intelligence": [
+        "AI",
+        "artificial intelligence",
+        "machine learning",
+        "ML",
+        "LLM",
+        "LLMs",
+    ],
+    "Introduction to Database": ["database", "databases", "sql", "postgresql"],
+    "Introduction to Information Security": [
+        "security",
+        "authentication",
+        "encryption",
+        "vulnerability",
+        "oauth",
+    ],
+    "System Programming": ["systems programming", "low-level", "c++", "embedded"],
+    "Computer Networks": [
+        "networking",
+        "network protocols",
+        "tcp",
+        "http",
+        "distributed systems",
+    ],
+    "Network Programming": ["socket", "sockets", "websocket", "grpc"],
+}
+
+
+@dataclass
+class LocalSelection:
+    items: List[str]
+    confidence: float
+
+
+def count_mentions(text: str, aliases: List[str]) -> int:
+    """Count non-overlapping mentions of any alias, preferring longer ones."""
+    alternatives = "|".join(
+        re.escape(alias) if alias.islower() else f"(?-i:{re.escape(alias)})"
+        for alias in sorted(aliases, key=len, reverse=True)
+    )
+    pattern = rf"(?<![\w+])(?:{alternatives})(?![\w+])"
+    return len(re.findall(pattern, text, re.IGNORECASE))
+
+
+def _name_alias(name: str) -> str:
+    """Match a candidate's own name; acronyms like "REST" only in capitals."""
+    return name if name.isupper() else name.lower()
+
+
+def rank_by_keywords(
+    job_description: str,
+    candidates: List[str],
+    keywords: Dict[str, List[str]],
+    limit: int,
+    min_matches: int,
+) -> LocalSelection:
+    """
+    Rank candidates by how often their keywords appear in the job description.
+
+    A candidate matches on its own name as well as on its keywords. Only
+    candidates mentioned in the job description are returned, ordered by
+    score. Confidence is the share of ``min_matches`` that was actually matched.
+    """
+    scores = {
+        candidate: count_mentions(
+            job_description, [_name_alias(candidate), *keywords.get(candidate, [])]
+        )
+        for candidate in candidates
+    }
+    matched = sorted(
+        (candidate for candidate in candidates if scores[candidate]),
+        key=lambda candidate: -scores[candidate],
+    )
+    return LocalSelection(
+        items=matched[:limit],
+        confidence=min(1.0, len(matched) / min_matches) if min_matches else 1.0,
+    )
+
+
+def select_skills(
+    job_description: str, tools: List[str], limit: int = 8, min_matches: int = 3
+) -> LocalSelection:
+    """Pick the resume tools most relevant to a job description."""
+    return rank_by_keywords(job_description, tools, SKILL_ALIASES, limit, min_matches)
+
+
+def select_coursework(
+    job_description: str, courses: List[str], limit: int = 5, min_matches: int = 2
+) -> LocalSelection:
+    """Pick the courses most relevant to a job description."""
+    return rank_by_keywords(
+        job_description, courses, COURSEWORK_KEYWORDS, limit, min_matches
+    )
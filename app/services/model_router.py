@@ -0,0 +1,252 @@
+import threading
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app.config.settings import get_settings
+from app.services.gemini_client import get_gemini_client
+
+# Sections that only pick items from existing lists run on the fast tier.
+# Output length is left to the model; prompts already cap words per item and
+# a hard token limit would truncate the JSON, so only SECTION_ROUTES sets one.
+SECTION_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "summary": {"tier": "strong", "temperature": 0.4},
+    "skills": {"tier": "fast", "temperature": 0.2},
+    "skills_summary": {"tier": "fast", "temperature": 0.4},
+    "experiences": {"tier": "strong", "temperature": 0.4},
+    "projects": {"tier": "strong", "temperature": 0.4},
+    "coursework": {"tier": "fast", "temperature": 0.0},
+    "localization": {"tier": "strong", "temperature": 0.2},
+    "cover_letter": {"tier": "strong", "temperature": 0.6},
+    "translation": {"tier": "strong", "temperature": 0.0},
+}
+
+
+# Repair calls per model before moving on to the fallback model
+MAX_REPAIR_ATTEMPTS = 2
+
+# Returns human-readable problems with a parsed section, empty when valid
+SectionValidator = Callable[[Any], List[str]]
+
+
+class SectionGenerationError(Exception):
+    """Raised when a section can't be produced even after repair and fallback."""
+
+    def __init__(self, section: str, errors: List[str]):
+        self.section = section
+        self.errors = errors
+        super().__init__(f"Failed to generate {section} section: {'; '.join(errors)}")
+
+
+def build_repair_prompt(section: str, fragment: str, errors: List[str]) -> str:
+    """
+    Ask the model to fix only the invalid JSON instead of redoing the section.
+
+    Only suitable for field-level schema errors: the prompt carries no resume
+    data, so anything missing from the fragment would have to be invented.
+    """
+    error_lines = "\n".join(f"- {error}" for error in errors)
+    return f"""
+    The JSON below was generated for the "{section}" section of a resume but
+    failed validation.
+
+    Errors:
+    {error_lines}
+
+    JSON:
+    {fragment}
+
+    Fix only what the errors describe and return the corrected JSON with the
+    same structure and content otherwise unchanged.
+    """
+
+
+def build_retry_prompt(prompt: str, errors: List[str]) -> str:
+    """Resend the section's original prompt with the previous answer's errors."""
+    error_lines = "\n".join(f"- {error}" for error in errors)
+    return f"""{prompt}
+
+    A previous answer to this request failed validation:
+    {error_lines}
+
+    Answer the request again from the data above and avoid these problems.
+    """
+
+
+class SectionRoute(BaseModel):
+    model: str
+    fallback_model: Optional[str] = None
+    max_output_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    thinking_budget: Optional[int] = None
+
+
+@dataclass
+class RouteStats:
+    calls: int = 0
+    failures: int = 0
+    fallbacks: int = 0
+    repairs: int = 0
+    total_latency: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+
+
+def get_section_route(section: str) -> SectionRoute:
+    """Resolve the model and budget for a section from defaults and settings."""
+    settings = get_settings()
+    defaults = dict(SECTION_DEFAULTS.get(section, {"tier": "strong"}))
+    tier = defaults.pop("tier")
+    if tier == "fast":
+        defaults["model"] = settings.GEMINI_FAST_MODEL
+        defaults["fallback_model"] = settings.GEMINI_STRONG_MODEL
+    else:
+        defaults["model"] = settings.GEMINI_STRONG_MODEL
+    return SectionRoute(**{**defaults, **settings.SECTION_ROUTES.get(section, {})})
+
+
+class ModelRouter:
+    """
+    Send each resume section to its configured model.
+
+    A response with only field-level schema errors is repaired by resending
+    just the invalid JSON with its errors. Truncated or unparseable output and
+    section validation errors (wrong item counts and the like) need the source
+    data, so the original prompt is resent with the errors instead. If that
+    doesn't help the section is retried on its fallback model. Latency, tokens
+    and cost are recorded per ``section/model`` route.
+    """
+
+    def __init__(self):
+        self._stats: Dict[str, RouteStats] = {}
+        self._lock = threading.Lock()
+
+    def generate(
+        self,
+        section: str,
+        prompt: str,
+        schema: Any,
+        validate: Optional[SectionValidator] = None,
+    ) -> Any:
+        route = get_section_route(section)
+        models = [route.model]
+        if route.fallback_model:
+            models.append(route.fallback_model)
+
+        errors: List[str] = []
+        for index, model in enumerate(models):
+            if index:
+                with self._lock:
+                    self._route_stats(section, models[index - 1]).fallbacks += 1
+            parsed, text, errors, fragment_only = self._call(
+                section, model, route, prompt, schema, validate
+            )
+            for _ in range(MAX_REPAIR_ATTEMPTS):
+                if not errors:
+                    break
+                with self._lock:
+                    self._route_stats(section, model).repairs += 1
+                repair_prompt = (
+                    build_repair_prompt(section, text, errors)
+                    if fragment_only
+                    else build_retry_prompt(prompt, errors)
+                )
+                parsed, text, errors, fragment_only = self._call(
+                    section, model, route, repair_prompt, schema, validate
+                )
+            if not errors:
+                return parsed
+        raise SectionGenerationError(section, errors)
+
+    def _call(
+        self,
+        section: str,
+        model: str,
+        route: SectionRoute,
+        prompt: str,
+        schema: Any,
+        validate: Optional[SectionValidator],
+    ) -> Tuple[Any, Optional[str], List[str], bool]:
+        config = {
+            "response_mime_type": "application/json",
+            "response_schema": schema,
+        }
+        if route.max_output_tokens is not None:
+            config["max_output_tokens"] = route.max_output_tokens
+        if route.temperature is not None:
+            config["temperature"] = route.temperature
+        if route.thinking_budget is not None:
+            config["thinking_config"] = {"thinking_budget": route.thinking_budget}
+
+        started = time.perf_counter()
+        response = get_gemini_client().models.generate_content(
+            model=model, contents=prompt, config=config
+        )
+        latency = time.perf_counter() - started
+
+        parsed = response.parsed
+        errors = []
+        # Whether every error is a field-level schema error in parseable JSON
+        fragment_only = False
+        if parsed is None:
+            # The SDK drops output that fails the schema without saying why;
+            # validating the raw text recovers the per-field errors
+            try:
+                parsed = TypeAdapter(schema).validate_json(response.text or "")
+            except ValidationError as e:
+                errors.extend(
+                    f"{'.'.join(str(loc) for loc in error['loc']) or 'response'}: "
+                    f"{error['msg']}"
+                    for error in e.errors()
+                )
+                fragment_only = all(
+                    error["type"] != "json_invalid" for error in e.errors()
+                )
+        if not errors and validate is not None:
+            errors.extend(validate(parsed))
+        self._record(section, model, latency, response, failed=bool(errors))
+        return parsed, response.text, errors, fragment_only
+
+    def _route_stats(self, section: str, model: str) -> RouteStats:
+        return self._stats.setdefault(f"{section}/{model}", RouteStats())
+
+    def _record(
+        self, section: str, model: str, latency: float, response: Any, failed: bool
+    ) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        input_tokens = getattr(usage, "prompt_token_count", None) or 0
+        output_tokens = getattr(usage, "candidates_token_count", None) or 0
+        price = get_settings().MODEL_PRICES.get(model, {})
+        cost = (
+            input_tokens * price.get("input", 0.0)
+            + output_tokens * price.get("output", 0.0)
+        ) / 1_000_000
+        with self._lock:
+            stats = self._route_stats(section, model)
+            stats.calls += 1
+            stats.failures += int(failed)
+            stats.total_latency += latency
+            stats.input_tokens += input_tokens
+            stats.output_tokens += output_tokens
+            stats.cost_usd += cost
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                route: {
+                    **asdict(stats),
+                    "avg_latency": stats.total_latency / stats.calls
+                    if stats.calls
+                    else 0.0,
+                }
+                for route, stats in self._stats.items()
+            }
+
+
+@lru_cache()
+def get_model_router() -> ModelRouter:
+    return ModelRouter()
@@ -1,9 +1,42 @@
-from typing import Dict
-
-from pydantic import BaseModel
-
-from app.services.gemini_client import client
-from app.utils.language import get_language_name
+import copy
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app.config.settings import get_settings
+from app.services.cancellation import CancellationToken
+from app.services.local_selector import (
+    LocalSelection,
+    SelectionMode,
+    select_coursework,
+    select_skills,
+)
+from app.services.model_router import (
+    SectionValidator,
+    get_model_router,
+    get_section_route,
+)
+from app.services.shared_state import LLM_NAMESPACE, get_shared_state
+from app.services.translation_memory import localize_resume_data, lookup
+from app.utils.language import Language, get_coursework_prefix, get_language_name
+
+VariantStyle = Literal["balanced", "concise", "detailed", "impact", "technical"]
+
+# Extra writing guidance per variant; only the prose sections depend on it
+VARIANT_STYLES: Dict[VariantStyle, str] = {
+    "balanced": "",
+    "concise": "Style: keep every sentence and bullet short and direct, "
+    "using the fewest words that preserve the achievement.",
+    "detailed": "Style: give fuller context for each achievement, naming the "
+    "scale, technologies and responsibilities involved.",
+    "impact": "Style: lead with measurable outcomes and business impact "
+    "before implementation details.",
+    "technical": "Style: emphasize technical depth such as architecture, "
+    "tooling and engineering trade-offs.",
+}
 
 
 class ExperienceBullet(BaseModel):
@@ -24,6 +57,10 @@ class SkillsSection(BaseModel):
     comma_separated_text: str
 
 
+class SkillsSummary(BaseModel):
+    summary_text: str
+
+
 class CourseworkSection(BaseModel):
     selected_coursework: list[str]
     comma_separated_text: str
@@ -49,20 +86,124 @@ class ResumeContent(BaseModel):
     coursework: CourseworkSection
 
 
+def generate_structured(
+    prompt: str,
+    schema: Any,
+    section: str,
+    validate: Optional[SectionValidator] = None,
+) -> Any:
+    """
+    Ask Gemini for JSON matching ``schema``, reusing results across workers.
+
+    The model and output budget come from the section's route, and invalid
+    output is repaired per section. Validated responses are cached in the
+    shared state store keyed by route, JSON schema and prompt, so a retried
+    request only re-runs the sections that failed. Cached values that no longer
+    pass the schema or validator are dropped and regenerated.
+    """
+    adapter = TypeAdapter(schema)
+    route = get_section_route(section)
+    schema_json = json.dumps(adapter.json_schema(), sort_keys=True)
+    cache_key = hashlib.sha256(
+        f"{route.model_dump_json()}\n{schema_json}\n{prompt}".encode()
+    ).hexdigest()
+    store = get_shared_state()
+    cached = store.get(LLM_NAMESPACE, cache_key)
+    if cached is not None:
+        try:
+            parsed = adapter.validate_python(cached)
+        except ValidationError:
+            parsed = None
+        if parsed is not None and not (validate and validate(parsed)):
+            return parsed
+        store.delete(LLM_NAMESPACE, cache_key)
+
+    parsed = get_model_router().generate(section, prompt, schema, validate)
+    store.set(
+        LLM_NAMESPACE,
+        cache_key,
+        adapter.dump_python(parsed, mode="json"),
+        ttl=get_settings().LLM_CACHE_TTL_SECONDS,
+    )
+    return parsed
+
+
+def _check_count(label: str, items: list, minimum: int, maximum: int) -> List[str]:
+    if minimum <= len(items) <= maximum:
+        return []
+    expected = str(minimum) if minimum == maximum else f"{minimum}-{maximum}"
+    return [f"{label}: expected {expected} items, got {len(items)}"]
+
+
+def validate_experiences(
+    experiences: List[ExperienceBullet], minimum: int, maximum: int
+) -> List[str]:
+    return _check_count("experiences", experiences, minimum, maximum)
+
+
+def validate_skills(skills: SkillsSection) -> List[str]:
+    errors = _check_count("relevant_tools", skills.relevant_tools, 1, 50)
+    if not skills.comma_separated_text.strip():
+        errors.append("comma_separated_text: must not be empty")
+    return errors
+
+
+def validate_projects(
+    projects: ProjectsSection, count: int, bullets_per_project: int
+) -> List[str]:
+    errors = _check_count("projects", projects.projects, count, count)
+    for index, project in enumerate(projects.projects):
+        errors.extend(
+            _check_count(
+                f"projects.{index}.formatted_bullets",
+                project.formatted_bullets,
+                bullets_per_project,
+                bullets_per_project,
+            )
+        )
+    return errors
+
+
+def validate_coursework(
+    coursework: CourseworkSection, maximum: int, prefix: str
+) -> List[str]:
+    errors = _check_count(
+        "selected_coursework", coursework.selected_coursework, 1, maximum
+    )
+    if not coursework.comma_separated_text.startswith(prefix):
+        errors.append(f'comma_separated_text: must start with "{prefix}"')
+    return errors
+
+
 class ResumeContentBuilder:
     # Class constants for configuration
     MAX_EXPERIENCE_BULLET_WORDS = 150
     MAX_PROJECT_BULLET_WORDS = 150
     MAX_PROJECTS = 2
+    PROJECT_BULLETS = 2
     MAX_COURSEWORK = 5
     MAX_SUMMARY_SENTENCES = 2
     MAX_EXPERIENCE_BULLETS = 4
-
-    def __init__(self, job_description: str, resume_data: Dict, language: str):
+    MAX_SKILLS = 8
+    # Below this keyword-match confidence, "auto" selection falls back to Gemini
+    MIN_LOCAL_CONFIDENCE = 0.6
+
+    def __init__(
+        self,
+        job_description: str,
+        resume_data: Dict,
+        language: str,
+        selection_mode: SelectionMode = "auto",
+        style: VariantStyle = "balanced",
+    ):
         self.job_description = job_description
         self.resume_data = resume_data
+        # Remembered translations are filled in so Gemini only sees new text
+        self.prompt_data = localize_resume_data(resume_data, language)
         self.language = language
+        self.selection_mode = selection_mode
         self.language_name = get_language_name(language)
+        self.style_guidance = VARIANT_STYLES[style]
         self.professional_summary = None
         self.selected_experiences = None
         self.skills = None
@@ -81,7 +222,7 @@ class ResumeContentBuilder:
         that highlights key achievements and skills:
 
         Resume Data:
-        {self.resume_data}
+        {self.prompt_data}
 
         Job Description:
         {self.job_description}
@@ -89,25 +230,63 @@ class ResumeContentBuilder:
         Focus on:
         1. Relevant technical skills and experience
         2. Quantifiable achievements
-        3. Alignment with job requirements
+        3. Alignment with job requirements{self.style_line}
 
         Format the response as JSON with this structure:
         {{"summary": "your generated summary"}}
         """
 
-        summary_response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=summary_prompt,
-            config={
-                "response_mime_type": "application/json",
-                "response_schema": ProfessionalSummary,
-            },
+        self.professional_summary = generate_structured(
+            summary_prompt, ProfessionalSummary, "summary"
         )
-
-        self.professional_summary = summary_response.parsed
         return self
 
+    @property
+    def style_line(self) -> str:
+        # Balanced output adds nothing, so its prompts match single-style ones
+        if not self.style_guidance:
+            return ""
+        return f"\n\n        {self.style_guidance}"
+
+    def _use_local_selection(self, selection: LocalSelection) -> bool:
+        # Nothing was mentioned in the job description, so there is nothing to use
+        if self.selection_mode == "llm" or not selection.items:
+            return False
+        return (
+            self.selection_mode == "local"
+            or selection.confidence >= self.MIN_LOCAL_CONFIDENCE
+        )
+
     def build_skills(self) -> "ResumeContentBuilder":
+        selection = select_skills(
+            self.job_description,
+            self.resume_data["skills"]["tools_os_frameworks"],
+            limit=self.MAX_SKILLS,
+        )
+        if self._use_local_selection(selection):
+            # Tools are chosen locally; Gemini only writes the prose summary
+            summary_prompt = f"""
+            Write a short summary of technical capabilities for a resume based on
+            these tools, grouped naturally by capability (cloud, CI/CD, security, ...):
+
+            Tools: {selection.items}
+
+            Job Description:
+            {self.job_description}
+
+            Format as JSON with this structure:
+            {{"summary_text": "Experienced with AWS and Docker for cloud deployment."}}
+            """
+            summary = generate_structured(
+                summary_prompt, SkillsSummary, "skills_summary"
+            )
+            self.skills = SkillsSection(
+                relevant_tools=selection.items,
+                summary_text=summary.summary_text,
+                comma_separated_text=", ".join(selection.items),
+            )
+            return self
+
         skills_prompt = f"""
         Based on this resume data and job description, select the most relevant tools, frameworks, and technologies:
 
@@ -132,16 +311,9 @@ class ResumeContentBuilder:
         5. Ensure both formats cover key technical capabilities
         """
 
-        skills_response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=skills_prompt,
-            config={
-                "response_mime_type": "application/json",
-                "response_schema": SkillsSection,
-            },
+        self.skills = generate_structured(
+            skills_prompt, SkillsSection, "skills", validate_skills
         )
-
-        self.skills = skills_response.parsed
         return self
 
     def build_experiences(self) -> "ResumeContentBuilder":
@@ -149,7 +321,7 @@ class ResumeContentBuilder:
         Based on this resume data and job description, select and format the top {self.MAX_EXPERIENCE_BULLETS} most relevant experiences in {self.language_name}:
 
         Resume Data:
-        {self.resume_data["experience"]}
+        {self.prompt_data["experience"]}
 
         Job Description:
         {self.job_description}
@@ -163,7 +335,7 @@ class ResumeContentBuilder:
            - Highlights relevant technical skills
            - Maintains professional tone
            - Focuses on impact and results
-        4. Prioritize experiences most relevant to the job description
+        4. Prioritize experiences most relevant to the job description{self.style_line}
 
         Format as a JSON list where each experience includes all fields plus a formatted_text field.
 
@@ -177,16 +349,14 @@ class ResumeContentBuilder:
         }}
         """
 
-        experiences_response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=experiences_prompt,
-            config={
-                "response_mime_type": "application/json",
-                "response_schema": list[ExperienceBullet],
-            },
+        self.selected_experiences = generate_structured(
+            experiences_prompt,
+            list[ExperienceBullet],
+            "experiences",
+            lambda experiences: validate_experiences(
+                experiences, 1, self.MAX_EXPERIENCE_BULLETS
+            ),
         )
-
-        self.selected_experiences = experiences_response.parsed
         return self
 
     def build_projects(self) -> "ResumeContentBuilder":
@@ -194,7 +364,7 @@ class ResumeContentBuilder:
         Based on this resume data and job description, select and format the {self.MAX_PROJECTS} most relevant projects in {self.language_name}:
 
         Resume Data:
-        {self.resume_data["projects"]}
+        {self.prompt_data["projects"]}
 
         Job Description:
         {self.job_description}
@@ -207,7 +377,7 @@ class ResumeContentBuilder:
            - Highlight relevant technologies
            - Focus on impact and results
            - Keep each bullet under {self.MAX_PROJECT_BULLET_WORDS} words
-        3. Order the projects by relevance to the job description
+        3. Order the projects by relevance to the job description{self.style_line}
 
         Format as JSON with this structure:
         {{
@@ -226,27 +396,51 @@ class ResumeContentBuilder:
         }}
         """
 
-        projects_response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=projects_prompt,
-            config={
-                "response_mime_type": "application/json",
-                "response_schema": ProjectsSection,
-            },
+        self.projects = generate_structured(
+            projects_prompt,
+            ProjectsSection,
+            "projects",
+            lambda projects: validate_projects(
+                projects, self.MAX_PROJECTS, self.PROJECT_BULLETS
+            ),
         )
-
-        self.projects = projects_response.parsed
         return self
 
     def build_coursework(self) -> "ResumeContentBuilder":
-        coursework_prefix = (
-            "관련 수강과목:" if self.language == "kr" else "Relevant Coursework:"
+        coursework_prefix = get_coursework_prefix(self.language)
+        courses = self.resume_data["coursework"]["list"]
+        translations = {course: lookup(course, self.language) for course in courses}
+        selection = select_coursework(
+            self.job_description, courses, limit=self.MAX_COURSEWORK
         )
+        # Other languages can only skip Gemini when every course is translated
+        if self._use_local_selection(selection) and all(
+            translations[course] for course in selection.items
+        ):
+            selected = [
+                course
+                if self.language == "en"
+                else f"{translations[course]} ({course})"
+                for course in selection.items
+            ]
+            self.coursework = CourseworkSection(
+                selected_coursework=selected,
+                comma_separated_text=f"{coursework_prefix} {', '.join(selected)}",
+            )
+            return self
+
+        known_translations = {
+            course: translation
+            for course, translation in translations.items()
+            if translation and self.language != "en"
+        }
+
         coursework_prompt = f"""
         Based on this resume data and job description, select the top {self.MAX_COURSEWORK} most relevant coursework in {self.language_name}:
 
         Resume Data:
-        Coursework: {self.resume_data["coursework"]["list"]}
+        Coursework: {courses}
+        Known translations (reuse as-is): {known_translations}
 
         Job Description:
         {self.job_description}
@@ -271,27 +465,31 @@ class ResumeContentBuilder:
 
         Important:
         1. Return the coursework in {self.language_name}
-        2. If the language is Korean:
-           - Translate the course names to Korean
+        2. If the language is not English:
+           - Translate the course names to {self.language_name}
            - Include the original English course name in parentheses
            - Example: "데이터베이스 시스템 (Database Systems)"
         3. Maintain the same meaning and technical accuracy in translation
-        4. Keep the comma-separated text in the same format with both languages when Korean
+        4. When not English, keep both languages in the comma-separated text
         5. The comma-separated text should start with "{coursework_prefix}"
         """
 
-        coursework_response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=coursework_prompt,
-            config={
-                "response_mime_type": "application/json",
-                "response_schema": CourseworkSection,
-            },
+        self.coursework = generate_structured(
+            coursework_prompt,
+            CourseworkSection,
+            "coursework",
+            lambda coursework: validate_coursework(
+                coursework, self.MAX_COURSEWORK, coursework_prefix
+            ),
         )
-
-        self.coursework = coursework_response.parsed
         return self
 
+    def with_style(self, style: VariantStyle) -> "ResumeContentBuilder":
+        """Copy this builder, keeping sections already built, for another style."""
+        variant = copy.copy(self)
+        variant.style_guidance = VARIANT_STYLES[style]
+        return variant
+
     def build(self) -> ResumeContent:
         return ResumeContent(
             professional_summary=self.professional_summary,
@@ -302,26 +500,170 @@ class ResumeContentBuilder:
         )
 
 
-def generate_resume(
-    job_description: str, resume_data: Dict, language: str
-) -> ResumeContent:
+def generate_resume_variants(
+    job_description: str,
+    resume_data: Dict,
+    language: str,
+    styles: List[VariantStyle],
+    selection_mode: SelectionMode = "auto",
+    cancellation: Optional[CancellationToken] = None,
+) -> Dict[VariantStyle, ResumeContent]:
     """
-    Generate tailored resume content using Gemini AI based on job description.
+    Generate several styles of resume content for one job description.
+
+    Skills and coursework do not depend on the style, so they are selected once
+    and shared; only the summary, experiences and projects are drafted per
+    style, with the variants running in parallel.
 
     Args:
         job_description (str): The job description to tailor the resume for
         resume_data (Dict): The base resume data from TOML config
-        language (str): The language to generate the resume in ("en" or "ko")
+        language (str): The language to generate the resumes in
+        styles (List[VariantStyle]): Writing styles to produce, one variant each
+        selection_mode (SelectionMode): How skills and coursework are selected
+        cancellation (CancellationToken): Stops pending sections once set
+
+    Returns:
+        Dict[VariantStyle, ResumeContent]: Resume content for each style, in order
+    """
+    shared = ResumeContentBuilder(
+        job_description, resume_data, language, selection_mode
+    )
+    for index, step in enumerate([shared.build_skills, shared.build_coursework]):
+        if cancellation is not None:
+            cancellation.raise_if_cancelled(sections=2 - index + 3 * len(styles))
+        step()
+
+    def draft(style: VariantStyle) -> ResumeContent:
+        builder = shared.with_style(style)
+        steps = [
+            builder.build_professional_summary,
+            builder.build_experiences,
+            builder.build_projects,
+        ]
+        for index, step in enumerate(steps):
+            if cancellation is not None:
+                cancellation.raise_if_cancelled(sections=len(steps) - index)
+            step()
+        return builder.build()
+
+    with ThreadPoolExecutor(max_workers=len(styles)) as executor:
+        return dict(zip(styles, executor.map(draft, styles), strict=True))
+
+
+def localize_resume(
+    content: ResumeContent, source_language: Language, target_language: Language
+) -> ResumeContent:
+    """
+    Translate already generated resume content into another language.
+
+    This is a single Gemini call, so extra languages reuse the selection and
+    drafting work done for the source language. Resume facts and course names
+    already in the translation memory are passed along to be reused as-is.
+
+    Args:
+        content (ResumeContent): Resume content generated in the source language
+        source_language (Language): Language the content is written in
+        target_language (Language): Language to translate the content into
 
     Returns:
-        ResumeContent: Generated resume content with formatted experiences
+        ResumeContent: The same selection of content in the target language
     """
-    return (
-        ResumeContentBuilder(job_description, resume_data, language)
-        .build_professional_summary()
-        .build_skills()
-        .build_experiences()
-        .build_projects()
-        .build_coursework()
-        .build()
+    target_name = get_language_name(target_language)
+    coursework_prefix = get_coursework_prefix(target_language)
+    known_translations = {}
+    # The memory holds translations of the English TOML facts
+    if source_language == "en" and target_language != "en":
+        sources = [
+            text
+            for experience in content.selected_experiences
+            for text in (experience.what, experience.how, experience.impact)
+        ] + content.coursework.selected_coursework
+        for source in sources:
+            translation = lookup(source, target_language)
+            if translation:
+                known_translations[source] = translation
+
+    localize_prompt = f"""
+    Translate this resume content
+    from {get_language_name(source_language)} to {target_name}.
+
+    Resume Content:
+    {content.model_dump_json()}
+
+    Known translations (reuse as-is): {known_translations}
+
+    Rules:
+    1. Keep exactly the same structure, items and order; do not add or drop anything
+    2. Translate all prose fields (summary, formatted_text, summary_text,
+       formatted_bullets, what, how, impact)
+    3. Keep technology names, project names, URLs and dates unchanged
+    4. Use a natural, professional resume register for {target_name}
+    5. Coursework:
+       - If {target_name} is not English, write each course as the translated name
+         followed by the original English name in parentheses,
+         for example "데이터베이스 시스템 (Database Systems)"
+       - comma_separated_text must start with "{coursework_prefix}"
+    """
+
+    def validate_localized(localized: ResumeContent) -> List[str]:
+        # Translation must keep the selection of the source content intact
+        return (
+            validate_experiences(
+                localized.selected_experiences,
+                len(content.selected_experiences),
+                len(content.selected_experiences),
+            )
+            + validate_projects(
+                localized.projects,
+                len(content.projects.projects),
+                ResumeContentBuilder.PROJECT_BULLETS,
+            )
+            + validate_coursework(
+                localized.coursework,
+                len(content.coursework.selected_coursework),
+                coursework_prefix,
+            )
+        )
+
+    return generate_structured(
+        localize_prompt, ResumeContent, "localization", validate_localized
     )
+
+
+def localize_resumes(
+    content: ResumeContent,
+    source_language: Language,
+    target_languages: List[Language],
+    cancellation: Optional[CancellationToken] = None,
+) -> Dict[Language, ResumeContent]:
+    """
+    Translate resume content into several languages in parallel.
+
+    Args:
+        content (ResumeContent): Resume content generated in the source language
+        source_language (Language): Language the content is written in
+        target_languages (List[Language]): Languages to translate the content into
+        cancellation (CancellationToken): Stops pending translations once set
+
+    Returns:
+        Dict[Language, ResumeContent]: The source content plus each translation
+    """
+    results = {source_language: content}
+
+    def localize(language: Language) -> ResumeContent:
+        if cancellation is not None:
+            cancellation.raise_if_cancelled(sections=1)
+        return localize_resume(content, source_language, language)
+
+    if target_languages:
+        with ThreadPoolExecutor(max_workers=len(target_languages)) as executor:
+            results.update(
+                zip(
+                    target_languages,
+                    executor.map(localize, target_languages),
+                    strict=True,
+                )
+            )
+    return results
+
@@ -0,0 +1,144 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+from app.config.settings import get_settings
+
+# Namespaces shared by every worker process
+LLM_NAMESPACE = "llm"
+TEMPLATES_NAMESPACE = "templates"
+JOBS_NAMESPACE = "jobs"
+TRANSLATIONS_NAMESPACE = "translations"
+
+
+class SharedStateStore:
+    """
+    Key-value store backed by a SQLite file in WAL mode.
+
+    All uvicorn workers open the same file, so cached values survive restarts
+    and are shared between processes. Values are stored as JSON.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS shared_state (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            # Credentials were once cached here; keep secrets only on disk
+            conn.execute("DELETE FROM shared_state WHERE namespace = 'credentials'")
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread and process; sqlite3 objects can't be shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value, expires_at FROM shared_state "
+                "WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            )
+            .fetchone()
+        )
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(
+        self, namespace: str, key: str, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        self._connection().execute(
+            "INSERT OR REPLACE INTO shared_state (namespace, key, value, expires_at) "
+            "VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(value), expires_at),
+        )
+
+    def claim(
+        self, namespace: str, key: str, value: Any, ttl: Optional[float] = None
+    ) -> bool:
+        """Store ``value`` only if the key is absent or expired; True if stored."""
+        now = time.time()
+        cursor = self._connection().execute(
+            "INSERT INTO shared_state (namespace, key, value, expires_at) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (namespace, key) DO UPDATE SET "
+            "value = excluded.value, expires_at = excluded.expires_at "
+            "WHERE shared_state.expires_at IS NOT NULL "
+            "AND shared_state.expires_at < ?",
+            (namespace, key, json.dumps(value), now + ttl if ttl else None, now),
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, namespace: str, key: str) -> None:
+        self._connection().execute(
+            "DELETE FROM shared_state WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        )
+
+    def keys(self, namespace: str, prefix: str = "") -> List[str]:
+        rows = self._connection().execute(
+            "SELECT key FROM shared_state "
+            "WHERE namespace = ? AND substr(key, 1, ?) = ?",
+            (namespace, len(prefix), prefix),
+        )
+        return [row[0] for row in rows]
+
+    def get_or_set(
+        self,
+        namespace: str,
+        key: str,
+        factory: Callable[[], Any],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        value = self.get(namespace, key)
+        if value is None:
+            value = factory()
+            self.set(namespace, key, value, ttl)
+        return value
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return how many were removed."""
+        cursor = self._connection().execute(
+            "DELETE FROM shared_state WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (time.time(),),
+        )
+        return cursor.rowcount
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@lru_cache()
+def get_shared_state() -> SharedStateStore:
+    return SharedStateStore(get_settings().SHARED_STATE_PATH)
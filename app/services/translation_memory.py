@@ -0,0 +1,189 @@
+"""
+Translation memory for the static resume facts in the TOML file.
+
+Entries are keyed by target language and a hash of the source string, so
+editing a line in the TOML simply misses the memory and gets translated
+again. Fill the memory ahead of time with::
+
+    python -m app.services.translation_memory kr ja
+"""
+
+import argparse
+import hashlib
+from typing import Any, Dict, List, Optional, get_args
+
+from pydantic import BaseModel
+
+from app.services.model_router import get_model_router
+from app.services.shared_state import TRANSLATIONS_NAMESPACE, get_shared_state
+from app.services.toml_loader import load_resume_data
+from app.utils.language import Language, get_language_name
+
+DEFAULT_RESUME_DATA_PATH = "app/config/resume_data.toml"
+
+# Keys whose string values are prose worth translating; names, URLs, dates
+# and tech stacks stay as they are
+TRANSLATABLE_KEYS = {"title", "location", "role", "what", "how", "impact"}
+TRANSLATABLE_LIST_KEYS = {"lines", "bullets", "list"}
+SKIPPED_SECTIONS = {"skills", "certifications"}
+
+# Strings sent to Gemini per pre-translation request
+TRANSLATION_BATCH_SIZE = 40
+
+
+class TranslationBatch(BaseModel):
+    translations: list[str]
+
+
+def _entry_key(source: str, language: Language) -> str:
+    return f"{language}:{hashlib.sha256(source.encode()).hexdigest()}"
+
+
+def lookup(source: str, language: Language) -> Optional[str]:
+    """Return the stored translation of ``source``, if there is one."""
+    if language == "en":
+        return source
+    entry = get_shared_state().get(
+        TRANSLATIONS_NAMESPACE, _entry_key(source, language)
+    )
+    return entry["translation"] if entry else None
+
+
+def store(source: str, language: Language, translation: str) -> None:
+    get_shared_state().set(
+        TRANSLATIONS_NAMESPACE,
+        _entry_key(source, language),
+        {"source": source, "translation": translation},
+    )
+
+
+def _is_translatable(key: Optional[str]) -> bool:
+    return key in TRANSLATABLE_KEYS or key in TRANSLATABLE_LIST_KEYS
+
+
+def collect_strings(resume_data: Dict[str, Any]) -> List[str]:
+    """List the translatable strings of the resume data, without duplicates."""
+    strings: List[str] = []
+
+    def walk(value: Any, key: Optional[str]) -> None:
+        if isinstance(value, dict):
+            for child_key, child in value.items():
+                walk(child, child_key)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item, key if key in TRANSLATABLE_LIST_KEYS else None)
+        elif isinstance(value, str) and _is_translatable(key):
+            strings.append(value)
+
+    for section, value in resume_data.items():
+        if section not in SKIPPED_SECTIONS:
+            walk(value, section)
+    return list(dict.fromkeys(strings))
+
+
+def localize_resume_data(
+    resume_data: Dict[str, Any], language: Language
+) -> Dict[str, Any]:
+    """Copy the resume data with every remembered translation filled in."""
+    if language == "en":
+        return resume_data
+
+    def translate(value: Any, key: Optional[str]) -> Any:
+        if isinstance(value, dict):
+            return {
+                child_key: translate(child, child_key)
+                for child_key, child in value.items()
+            }
+        if isinstance(value, list):
+            child_key = key if key in TRANSLATABLE_LIST_KEYS else None
+            return [translate(item, child_key) for item in value]
+        if isinstance(value, str) and _is_translatable(key):
+            return lookup(value, language) or value
+        return value
+
+    return {
+        section: value if section in SKIPPED_SECTIONS else translate(value, section)
+        for section, value in resume_data.items()
+    }
+
+
+def _translate_batch(sources: List[str], language: Language) -> List[str]:
+    language_name = get_language_name(language)
+    prompt = f"""
+    Translate each of these resume phrases from English to {language_name}.
+    Keep technology names, product names and numbers unchanged and use a
+    natural, professional resume register.
+
+    Phrases:
+    {sources}
+
+    Return JSON with this structure, one translation per phrase in the same order:
+    {{"translations": ["translated phrase 1", "translated phrase 2"]}}
+    """
+
+    def validate(batch: TranslationBatch) -> List[str]:
+        if len(batch.translations) == len(sources):
+            return []
+        return [
+            f"translations: expected {len(sources)} items, "
+            f"got {len(batch.translations)}"
+        ]
+
+    batch = get_model_router().generate(
+        "translation", prompt, TranslationBatch, validate
+    )
+    return batch.translations
+
+
+def pretranslate(resume_data: Dict[str, Any], language: Language) -> Dict[str, int]:
+    """
+    Translate every string of the resume data missing from the memory.
+
+    Entries for strings no longer in the TOML are removed. Returns counts of
+    reused, translated and pruned entries.
+    """
+    sources = collect_strings(resume_data)
+    missing = [source for source in sources if lookup(source, language) is None]
+    for start in range(0, len(missing), TRANSLATION_BATCH_SIZE):
+        chunk = missing[start : start + TRANSLATION_BATCH_SIZE]
+        for source, translation in zip(
+            chunk, _translate_batch(chunk, language), strict=True
+        ):
+            store(source, language, translation)
+
+    shared_state = get_shared_state()
+    current = {_entry_key(source, language) for source in sources}
+    stale = [
+        key
+        for key in shared_state.keys(TRANSLATIONS_NAMESPACE, f"{language}:")
+        if key not in current
+    ]
+    for key in stale:
+        shared_state.delete(TRANSLATIONS_NAMESPACE, key)
+
+    return {
+        "reused": len(sources) - len(missing),
+        "translated": len(missing),
+        "pruned": len(stale),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-translate the resume TOML")
+    parser.add_argument(
+        "languages",
+        nargs="+",
+        choices=[code for code in get_args(Language) if code != "en"],
+        help="Language codes, e.g. kr ja",
+    )
+    parser.add_argument("--resume-data", default=DEFAULT_RESUME_DATA_PATH)
+    args = parser.parse_args()
+
+    resume_data = load_resume_data(args.resume_data)
+    for language in args.languages:
+        counts = pretranslate(resume_data, language)
+        print(f"{language}: {counts}")
+
+
+if __name__ == "__main__":
+    main()
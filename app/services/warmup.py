@@ -0,0 +1,80 @@
+import logging
+import time
+from typing import Dict
+
+from app.config.settings import get_settings, get_template_settings
+from app.services.gemini_client import get_gemini_client
+from app.services.shared_state import TEMPLATES_NAMESPACE, get_shared_state
+
+logger = logging.getLogger(__name__)
+
+# Discovery documents used by the request handlers
+DISCOVERY_DOCUMENTS = [("docs", "v1"), ("drive", "v3"), ("sheets", "v4")]
+
+
+def preload_discovery_documents() -> None:
+    """Parse the bundled discovery documents into the process cache."""
+    from app.services.google_docs import get_discovery_document
+
+    for service_name, version in DISCOVERY_DOCUMENTS:
+        get_discovery_document(service_name, version)
+
+
+def open_gemini_connection() -> None:
+    """Issue a metadata request so the Gemini HTTP pool has a live connection."""
+    get_gemini_client().models.get(model=get_settings().WARMUP_MODEL)
+
+
+def validate_templates() -> None:
+    """
+    Check that the configured template documents are reachable.
+
+    The template manifest is kept in the shared store, so only the first
+    worker to start within the TTL talks to Drive.
+    """
+    from app.services.google_auth import load_credentials
+    from app.services.google_docs import get_drive_service
+
+    settings = get_settings()
+    template_settings = get_template_settings()
+    store = get_shared_state()
+    drive_service = None
+    for template_id in (
+        template_settings.TEMPLATE_ID,
+        template_settings.KOREAN_TEMPLATE_ID,
+    ):
+        if store.get(TEMPLATES_NAMESPACE, template_id) is not None:
+            continue
+        if drive_service is None:
+            credentials = load_credentials(settings.TEST_USER_EMAIL)
+            drive_service = get_drive_service(credentials)
+        manifest = (
+            drive_service.files()
+            .get(fileId=template_id, fields="id,name,version,modifiedTime")
+            .execute()
+        )
+        store.set(
+            TEMPLATES_NAMESPACE,
+            template_id,
+            manifest,
+            ttl=settings.TEMPLATE_MANIFEST_TTL_SECONDS,
+        )
+
+
+def warm_up() -> Dict[str, float]:
+    """
+    Run every warm-up step and return how long each one took, in seconds.
+
+    Failures are logged rather than raised so a flaky upstream never keeps
+    the app from starting.
+    """
+    timings = {}
+    steps = (preload_discovery_documents, open_gemini_connection, validate_templates)
+    for step in steps:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.warning("Warm-up step %s failed: %s", step.__name__, e)
+        timings[step.__name__] = time.perf_counter() - started
+    return timings
@@ -1,8 +1,29 @@
 from typing import Literal
 
-Language = Literal["en", "kr"]
+Language = Literal["en", "kr", "ja", "zh", "de"]
+
+LANGUAGE_NAMES = {
+    "en": "English",
+    "kr": "Korean",
+    "ja": "Japanese",
+    "zh": "Chinese",
+    "de": "German",
+}
+
+COURSEWORK_PREFIXES = {
+    "en": "Relevant Coursework:",
+    "kr": "관련 수강과목:",
+    "ja": "関連科目:",
+    "zh": "相关课程:",
+    "de": "Relevante Kurse:",
+}
 
 
 def get_language_name(language: Language) -> str:
     """Get the display name for a language code."""
-    return "English" if language == "en" else "Korean"
+    return LANGUAGE_NAMES.get(language, "English")
+
+
+def get_coursework_prefix(language: Language) -> str:
+    """Get the label that starts the coursework line for a language code."""
+    return COURSEWORK_PREFIXES.get(language, COURSEWORK_PREFIXES["en"])
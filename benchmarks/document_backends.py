@@ -0,0 +1,96 @@
+"""
+Compare the "copy" and "import" document-creation backends.
+
+Creates resume documents from static TOML content (no Gemini calls) with
+each backend against the real Google APIs, using the stored credentials of
+TEST_USER_EMAIL, and deletes them afterwards.
+
+    python benchmarks/document_backends.py --runs 5 --language en
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.config.settings import get_settings  # noqa: E402
+from app.services.google_auth import load_credentials  # noqa: E402
+from app.services.google_docs import (  # noqa: E402
+    ResumeData,
+    create_resume_document,
+    delete_document,
+)
+from app.services.resume_generator import (  # noqa: E402
+    CourseworkSection,
+    Project,
+    ProjectsSection,
+    SkillsSection,
+)
+from app.services.toml_loader import load_resume_data  # noqa: E402
+
+
+def sample_resume_data(title: str) -> ResumeData:
+    data = load_resume_data(ROOT / "app/config/resume_data.toml")
+    bullets = [
+        bullet["what"]
+        for experience in data["experience"].values()
+        for bullet in experience["bullets"]
+    ]
+    tools = data["skills"]["tools_os_frameworks"][:8]
+    courses = data["coursework"]["list"][:5]
+    projects = [
+        Project(
+            name=project["name"],
+            url=project["url"],
+            date=project["date"],
+            tech_stack=project["tech_stack"],
+            formatted_bullets=project["bullets"][:2],
+        )
+        for project in list(data["projects"].values())[:2]
+    ]
+    return ResumeData(
+        title=title,
+        professional_summary=" ".join(data["summary"]["lines"]),
+        experiences=bullets[:4],
+        skills=SkillsSection(
+            relevant_tools=tools,
+            summary_text=", ".join(tools),
+            comma_separated_text=", ".join(tools),
+        ),
+        projects=ProjectsSection(projects=projects),
+        coursework=CourseworkSection(
+            selected_coursework=courses,
+            comma_separated_text=f"Relevant Coursework: {', '.join(courses)}",
+        ),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--language", default="en")
+    args = parser.parse_args()
+
+    credentials = load_credentials(get_settings().TEST_USER_EMAIL)
+    for backend in ("copy", "import"):
+        durations = []
+        for run in range(args.runs):
+            resume_data = sample_resume_data(f"Backend benchmark {backend} {run}")
+            started = time.perf_counter()
+            document = create_resume_document(
+                credentials, resume_data, args.language, backend=backend
+            )
+            durations.append((time.perf_counter() - started) * 1000)
+            delete_document(credentials, document.id)
+        print(
+            f"{backend:>6}: median {statistics.median(durations):8.1f} ms  "
+            f"first {durations[0]:8.1f} ms  max {max(durations):8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Compare cache hit rate of per-worker caches and the shared SQLite store.
+
+Several processes request keys from the same skewed key space, the way
+uvicorn workers see repeated job descriptions. Misses pay a simulated
+upstream latency.
+
+    python benchmarks/shared_cache.py --workers 4 --requests 500
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.shared_state import SharedStateStore  # noqa: E402
+
+
+def _keys(seed: int, requests: int, key_space: int) -> list:
+    rng = random.Random(seed)
+    return [str(int(rng.paretovariate(1.2)) % key_space) for _ in range(requests)]
+
+
+def _upstream(key: str, latency: float) -> dict:
+    time.sleep(latency)
+    return {"key": key}
+
+
+def run_local(args: tuple) -> tuple:
+    seed, requests, key_space, latency, _ = args
+    cache, hits = {}, 0
+    for key in _keys(seed, requests, key_space):
+        if key in cache:
+            hits += 1
+        else:
+            cache[key] = _upstream(key, latency)
+    return hits, requests
+
+
+def run_shared(args: tuple) -> tuple:
+    seed, requests, key_space, latency, path = args
+    store = SharedStateStore(path)
+    for key in _keys(seed, requests, key_space):
+        store.get_or_set("bench", key, lambda key=key: _upstream(key, latency))
+    return store.hits, requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--key-space", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "shared_state.db")
+        jobs = [
+            (seed, args.requests, args.key_space, args.latency, path)
+            for seed in range(args.workers)
+        ]
+        for name, runner in (("per-worker", run_local), ("shared", run_shared)):
+            started = time.perf_counter()
+            with Pool(args.workers) as pool:
+                results = pool.map(runner, jobs)
+            elapsed = time.perf_counter() - started
+            hits = sum(result[0] for result in results)
+            total = sum(result[1] for result in results)
+            print(f"{name:>10}: hit rate {hits / total:6.1%}  wall {elapsed:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
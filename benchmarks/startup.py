@@ -0,0 +1,65 @@
+"""
+Measure cold-start time of the API.
+
+Each run starts a fresh interpreter, imports ``main`` and then drives the
+FastAPI lifespan, so both import cost and startup cost are visible.
+
+    python benchmarks/startup.py --runs 10 [--warmup]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def startup():
+    async with main.app.router.lifespan_context(main.app):
+        pass
+
+asyncio.run(startup())
+ready = time.perf_counter()
+print(json.dumps({"import": imported - started, "lifespan": ready - imported}))
+"""
+
+
+def run_once(warmup: bool) -> dict:
+    env = dict(os.environ, WARMUP_ON_STARTUP=str(warmup))
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--warmup", action="store_true")
+    args = parser.parse_args()
+
+    samples = [run_once(args.warmup) for _ in range(args.runs)]
+    for phase in ("import", "lifespan"):
+        values = [sample[phase] * 1000 for sample in samples]
+        print(
+            f"{phase:>8}: median {statistics.median(values):8.1f} ms  "
+            f"max {max(values):8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,38 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.concurrency import run_in_threadpool
 
-from app.config.settings import get_settings
+from app.config.settings import get_settings, get_template_settings
 from app.routers import auth, docs, resume
+from app.services.gemini_client import get_gemini_client
+from app.services.google_sheets import get_tracking_writer
+from app.services.shared_state import get_shared_state
+from app.services.warmup import warm_up
 
 settings = get_settings()
 
-app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Construct upstream clients at startup instead of at import time."""
+    get_template_settings()
+    get_gemini_client()
+    get_shared_state().purge_expired()
+    if settings.WARMUP_ON_STARTUP:
+        app.state.warmup_timings = await run_in_threadpool(warm_up)
+    tracking_writer = get_tracking_writer()
+    if tracking_writer is not None:
+        tracking_writer.start()
+    yield
+    if tracking_writer is not None:
+        await run_in_threadpool(tracking_writer.stop)
+
+
+app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG, lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -17,6 +42,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Compress large payloads such as full document reads
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 # Include routers
 app.include_router(auth.router)